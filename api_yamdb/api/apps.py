@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     name = 'api'
     verbose_name = 'Приложение API'
+
+    def ready(self):
+        from django.core.signals import request_started
+        from django.db.backends.signals import connection_created
+
+        from api import authentication  # noqa: F401
+        from api_yamdb.db import check_connections, set_sqlite_pragmas
+
+        request_started.connect(check_connections)
+        connection_created.connect(set_sqlite_pragmas)
@@ -0,0 +1,55 @@
+"""Асинхронные обработчики для нагруженных GET-эндпоинтов под ASGI.
+
+Под ASGI Django 3.2 выполняет все синхронные представления в одном общем
+потоке, поэтому запросы обрабатываются по очереди. Асинхронного ORM
+в Django 3.2 нет, так что обработчики отдают безопасные запросы
+в пул потоков, где они выполняются параллельно, каждый со своим
+соединением с БД. Остальные методы выполняются в общем потоке,
+как и без обёртки.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.urls import URLPattern
+from rest_framework.permissions import SAFE_METHODS
+
+ASYNC_URL_NAMES = (
+    'titles-list', 'titles-detail', 'reviews-list', 'comments-list'
+)
+
+
+def async_read_view(view):
+    """Оборачивает синхронное представление DRF в асинхронное."""
+    def read(request, *args, **kwargs):
+        close_old_connections()
+        try:
+            response = view(request, *args, **kwargs)
+            # Рендеринг тоже выполняется в пуле, а не в общем потоке.
+            return response.render()
+        finally:
+            close_old_connections()
+
+    read_in_pool = sync_to_async(read, thread_sensitive=False)
+    write = sync_to_async(view)
+
+    @wraps(view)
+    async def async_view(request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return await read_in_pool(request, *args, **kwargs)
+        return await write(request, *args, **kwargs)
+
+    return async_view
+
+
+def make_async(urlpatterns, names=ASYNC_URL_NAMES):
+    """Заменяет представления маршрутов `names` асинхронными."""
+    return [
+        URLPattern(
+            pattern.pattern, async_read_view(pattern.callback),
+            pattern.default_args, pattern.name
+        )
+        if isinstance(pattern, URLPattern) and pattern.name in names
+        else pattern
+        for pattern in urlpatterns
+    ]
@@ -0,0 +1,106 @@
+"""Аутентификация по JWT без чтения пользователя на каждый запрос.
+
+Токен, выданный `obtain_jwt_view`, содержит имя, роль и `is_staff`
+пользователя, и из них строится неполный объект `User`. Чтобы
+заблокированный или лишённый прав пользователь не пользовался старым
+токеном, его состояние проверяется по кешу процесса, который хранит
+строку из БД не дольше `JWT_USER_STATE_TTL` секунд.
+"""
+import time
+
+from django.conf import settings
+from django.db import router
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import User
+
+CLAIMS = ('username', 'role', 'is_staff')
+STATE_FIELDS = ('username', 'role', 'is_staff', 'is_active')
+
+_user_states = {}
+
+
+def get_token_for_user(user):
+    token = AccessToken.for_user(user)
+    for claim in CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+def get_user_state(user_id):
+    """Возвращает (username, role, is_staff, is_active) или None."""
+    now = time.monotonic()
+    cached = _user_states.get(user_id)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    state = User.objects.filter(id=user_id).values_list(
+        *STATE_FIELDS
+    ).first()
+    if len(_user_states) >= settings.JWT_USER_STATE_MAX_SIZE:
+        _user_states.clear()
+    _user_states[user_id] = (now + settings.JWT_USER_STATE_TTL, state)
+    return state
+
+
+def forget_user_state(user_id=None):
+    if user_id is None:
+        _user_states.clear()
+    else:
+        _user_states.pop(user_id, None)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    # Другие процессы узнают об изменении не позже чем через TTL.
+    forget_user_state(instance.id)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """Строит пользователя из утверждений токена."""
+
+    def get_user(self, validated_token):
+        if any(claim not in validated_token for claim in CLAIMS):
+            # Токены, выданные без утверждений, проверяются по БД.
+            return super().get_user(validated_token)
+        try:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError):
+            raise AuthenticationFailed(
+                'Токен не содержит идентификатор пользователя.',
+                code='token_not_valid'
+            )
+        state = get_user_state(user_id)
+        if state is None:
+            raise AuthenticationFailed(
+                'Пользователь не найден.', code='user_not_found'
+            )
+        _, role, is_staff, is_active = state
+        if not is_active:
+            raise AuthenticationFailed(
+                'Пользователь заблокирован.', code='user_inactive'
+            )
+        if (role, is_staff) != (
+            validated_token['role'], validated_token['is_staff']
+        ):
+            raise AuthenticationFailed(
+                'Права пользователя изменились, получите новый токен.',
+                code='token_not_valid'
+            )
+        values = dict(zip(('id',) + STATE_FIELDS, (user_id,) + state))
+        # Model.from_db ожидает значения в порядке полей модели,
+        # остальные поля остаются отложенными.
+        fields = [
+            field.attname for field in User._meta.concrete_fields
+            if field.attname in values
+        ]
+        return User.from_db(
+            router.db_for_read(User),
+            fields,
+            [values[field] for field in fields]
+        )
@@ -0,0 +1,380 @@
+"""Пакетное создание произведений, отзывов и комментариев.
+
+Каждый элемент пакета проверяется отдельно, а связанные объекты
+(авторы, произведения, жанры, категории) читаются одним запросом на весь
+пакет. Прошедшие проверку элементы записываются в одной транзакции,
+рейтинг каждого произведения обновляется один раз. В ответе для каждого
+элемента возвращается сохранённый объект или его ошибки.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from api.cache import invalidate
+from api.serializers import (
+    CommentBulkSerializer, ReviewBulkSerializer, TitleBulkSerializer,
+    TitleReadSerializer
+)
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+
+def insert(model, objects):
+    """Вставляет объекты пачками и возвращает их с первичными ключами."""
+    if connection.features.can_return_rows_from_bulk_insert:
+        return model.objects.bulk_create(
+            objects, batch_size=settings.BULK_BATCH_SIZE
+        )
+    # Django 3.2 не получает ключи из bulk_create на SQLite,
+    # поэтому объекты вставляются по одному в общей транзакции.
+    for obj in objects:
+        obj.save(force_insert=True)
+    return objects
+
+
+class BaseBulkCreator:
+    """Проверяет и создаёт пакет объектов.
+
+    Наследник задаёт `serializer_class` и методы `build(valid)`,
+    возвращающий несохранённые объекты по номерам элементов,
+    и `save(objects)`, записывающий их в открытой транзакции.
+    """
+
+    serializer_class = None
+
+    def __init__(self, request):
+        self.request = request
+        self.errors = {}
+
+    def get_items(self, data):
+        if not isinstance(data, list) or not data:
+            raise ValidationError('Ожидается непустой список объектов.')
+        if len(data) > settings.BULK_MAX_ITEMS:
+            raise ValidationError(
+                f'За один запрос можно создать не больше '
+                f'{settings.BULK_MAX_ITEMS} объектов.'
+            )
+        return data
+
+    def get_serializer(self, item):
+        return self.serializer_class(
+            data=item, context={'request': self.request}
+        )
+
+    def validate(self, data):
+        """Возвращает {номер элемента: validated_data} для корректных."""
+        valid = {}
+        for index, item in enumerate(self.get_items(data)):
+            serializer = self.get_serializer(item)
+            if serializer.is_valid():
+                valid[index] = serializer.validated_data
+            else:
+                self.errors[index] = serializer.errors
+        return valid
+
+    def get_authors(self, valid):
+        """Разрешает имена авторов одним запросом."""
+        user = self.request.user
+        usernames = {
+            data['author'] for data in valid.values()
+            if data.get('author', user.username) != user.username
+        }
+        if usernames and not user.is_admin:
+            self.reject(
+                valid,
+                lambda data: data.get('author') in usernames,
+                {'author': ['Указывать автора может только администратор.']}
+            )
+            usernames = set()
+        authors = User.objects.only('id', 'username').in_bulk(
+            usernames, field_name='username'
+        )
+        authors[user.username] = user
+        self.reject(
+            valid,
+            lambda data: data.get('author', user.username) not in authors,
+            {'author': ['Пользователь не найден.']}
+        )
+        return authors
+
+    def get_author(self, authors, data):
+        return authors[data.get('author', self.request.user.username)]
+
+    def reject(self, valid, condition, errors):
+        for index, data in list(valid.items()):
+            if condition(data):
+                self.errors[index] = errors
+                del valid[index]
+
+    def create(self, data):
+        valid = self.validate(data)
+        objects = self.build(valid) if valid else {}
+        try:
+            with transaction.atomic():
+                self.save(list(objects.values()))
+        except IntegrityError:
+            raise ValidationError(
+                'Данные изменились во время загрузки, повторите запрос.'
+            )
+        return self.get_response(len(data), objects)
+
+    def get_item_status(self, index):
+        return status.HTTP_201_CREATED
+
+    def represent(self, objects):
+        return {
+            index: self.serializer_class(obj).data
+            for index, obj in objects.items()
+        }
+
+    def get_response(self, size, objects):
+        data = self.represent(objects)
+        results = []
+        for index in range(size):
+            if index in objects:
+                results.append({
+                    'status': self.get_item_status(index),
+                    'data': data[index],
+                })
+            else:
+                results.append({
+                    'status': status.HTTP_400_BAD_REQUEST,
+                    'errors': self.errors[index],
+                })
+        if not self.errors:
+            code = (
+                status.HTTP_201_CREATED
+                if all(item['status'] == status.HTTP_201_CREATED
+                       for item in results)
+                else status.HTTP_200_OK
+            )
+        elif objects:
+            code = status.HTTP_207_MULTI_STATUS
+        else:
+            code = status.HTTP_400_BAD_REQUEST
+        return Response(results, status=code)
+
+
+class ReviewBulkCreator(BaseBulkCreator):
+    """Создаёт отзывы к одному произведению или к разным.
+
+    Если `title` не задано, произведение указывается в каждом элементе.
+    """
+
+    serializer_class = ReviewBulkSerializer
+
+    def __init__(self, request, title=None):
+        super().__init__(request)
+        self.title = title
+
+    def get_title_ids(self, valid):
+        if self.title is not None:
+            for data in valid.values():
+                data['title_id'] = self.title.id
+            return
+        self.reject(
+            valid,
+            lambda data: 'title_id' not in data,
+            {'title': ['Обязательное поле.']}
+        )
+        existing = set(Title.objects.filter(
+            id__in={data['title_id'] for data in valid.values()}
+        ).values_list('id', flat=True))
+        self.reject(
+            valid,
+            lambda data: data['title_id'] not in existing,
+            {'title': ['Произведение не найдено.']}
+        )
+
+    def build(self, valid):
+        self.get_title_ids(valid)
+        authors = self.get_authors(valid)
+        keys = {
+            index: (
+                data['title_id'],
+                self.get_author(authors, data).id
+            )
+            for index, data in valid.items()
+        }
+        taken = set(Review.objects.filter(
+            title_id__in={title_id for title_id, _ in keys.values()},
+            author_id__in={author_id for _, author_id in keys.values()}
+        ).values_list('title_id', 'author_id'))
+        objects = {}
+        for index, data in valid.items():
+            if keys[index] in taken:
+                self.errors[index] = {'non_field_errors': [
+                    'Автор уже оставлял отзыв на это произведение.'
+                ]}
+                continue
+            taken.add(keys[index])
+            objects[index] = Review(
+                title_id=data['title_id'],
+                author=self.get_author(authors, data),
+                text=data['text'],
+                score=data['score']
+            )
+        return objects
+
+    def save(self, reviews):
+        insert(Review, reviews)
+        scores = defaultdict(list)
+        for review in reviews:
+            scores[review.title_id].append(review.score)
+        for title_id, title_scores in scores.items():
+            Title.objects.filter(id=title_id).shift_rating(
+                sum(title_scores), len(title_scores)
+            )
+            invalidate('titles', f'reviews:{title_id}')
+
+
+class CommentBulkCreator(BaseBulkCreator):
+    """Создаёт комментарии к одному отзыву."""
+
+    serializer_class = CommentBulkSerializer
+
+    def __init__(self, request, review):
+        super().__init__(request)
+        self.review = review
+
+    def build(self, valid):
+        authors = self.get_authors(valid)
+        return {
+            index: Comment(
+                review=self.review,
+                author=self.get_author(authors, data),
+                text=data['text']
+            )
+            for index, data in valid.items()
+        }
+
+    def save(self, comments):
+        insert(Comment, comments)
+        if comments:
+            invalidate(f'comments:{self.review.id}')
+
+
+class TitleBulkCreator(BaseBulkCreator):
+    """Создаёт и обновляет произведения вместе со связями с жанрами."""
+
+    serializer_class = TitleBulkSerializer
+
+    def __init__(self, request):
+        super().__init__(request)
+        self.updated = set()
+        self.genres = []
+
+    def get_serializer(self, item):
+        return self.serializer_class(
+            data=item,
+            partial=isinstance(item, dict) and 'id' in item,
+            context={'request': self.request}
+        )
+
+    def get_item_status(self, index):
+        if index in self.updated:
+            return status.HTTP_200_OK
+        return status.HTTP_201_CREATED
+
+    def get_existing(self, valid):
+        ids = [data['id'] for data in valid.values() if 'id' in data]
+        self.reject(
+            valid,
+            lambda data: 'id' in data and ids.count(data['id']) > 1,
+            {'id': ['Произведение повторяется в пакете.']}
+        )
+        # Рейтинг в пакете не меняется и в UPDATE не попадает.
+        existing = Title.objects.defer(
+            'rating_sum', 'rating_count', 'rating'
+        ).in_bulk({data['id'] for data in valid.values() if 'id' in data})
+        self.reject(
+            valid,
+            lambda data: 'id' in data and data['id'] not in existing,
+            {'id': ['Произведение не найдено.']}
+        )
+        return existing
+
+    def get_related(self, valid, model, field, many=False):
+        """Разрешает слаги одной модели одним запросом."""
+        def get_slugs(data):
+            if field not in data:
+                return []
+            return data[field] if many else [data[field]]
+
+        objects = model.objects.in_bulk(
+            {slug for data in valid.values() for slug in get_slugs(data)},
+            field_name='slug'
+        )
+        for index, data in list(valid.items()):
+            missing = [
+                slug for slug in get_slugs(data) if slug not in objects
+            ]
+            if missing:
+                self.errors[index] = {field: [
+                    f'Объект со слагом {slug} не существует.'
+                    for slug in missing
+                ]}
+                del valid[index]
+        return objects
+
+    def build(self, valid):
+        existing = self.get_existing(valid)
+        genres = self.get_related(valid, Genre, 'genre', many=True)
+        categories = self.get_related(valid, Category, 'category')
+        objects = {}
+        for index, data in valid.items():
+            if 'id' in data:
+                title = existing[data['id']]
+                self.updated.add(index)
+            else:
+                title = Title()
+            for field in ('name', 'year', 'description'):
+                if field in data:
+                    setattr(title, field, data[field])
+            if 'category' in data:
+                title.category = categories[data['category']]
+            if 'genre' in data:
+                self.genres.append((title, {
+                    genres[slug].id for slug in data['genre']
+                }))
+            objects[index] = title
+        return objects
+
+    def save(self, titles):
+        through = Title.genre.through
+        new = [title for title in titles if title.pk is None]
+        old = [title for title in titles if title.pk is not None]
+        replaced = [
+            title.pk for title, _ in self.genres if title.pk is not None
+        ]
+        insert(Title, new)
+        if old:
+            Title.objects.bulk_update(
+                old,
+                ('name', 'year', 'description', 'category'),
+                batch_size=settings.BULK_BATCH_SIZE
+            )
+        if replaced:
+            through.objects.filter(title_id__in=replaced).delete()
+        through.objects.bulk_create(
+            (
+                through(title_id=title.pk, genre_id=genre_id)
+                for title, genre_ids in self.genres
+                for genre_id in genre_ids
+            ),
+            batch_size=settings.BULK_BATCH_SIZE
+        )
+        if titles:
+            invalidate('titles')
+
+    def represent(self, objects):
+        titles = Title.objects.select_related('category').prefetch_related(
+            'genre'
+        ).in_bulk([title.pk for title in objects.values()])
+        return {
+            index: TitleReadSerializer(titles[title.pk]).data
+            for index, title in objects.items()
+        }
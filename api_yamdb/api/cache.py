@@ -0,0 +1,168 @@
+"""Кеш ответов и ETag для безопасных запросов с инвалидацией по поколениям.
+
+Каждый ответ кешируется под ключом, в который входят текущие номера
+поколений его пространств имён (`titles`, `genres`, ...). Запись в любое
+из пространств увеличивает номер поколения, и все старые ключи
+перестают находиться без перебора и удаления. Из тех же поколений
+строится ETag ответа. Номера хранятся в БД (одним запросом на ответ),
+поэтому процессы с отдельными локальными кешами не отдают устаревшие
+ответы и ETag. Поколения ведёт модуль `reviews.generations`.
+"""
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from reviews.generations import get_generations, invalidate
+
+RESPONSE_KEY = 'api:response:{generations}:{url}'
+HITS_KEY = 'api:stats:hits'
+MISSES_KEY = 'api:stats:misses'
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def count(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+def get_stats():
+    stats = get_cache().get_many((HITS_KEY, MISSES_KEY))
+    return {
+        'hits': stats.get(HITS_KEY, 0),
+        'misses': stats.get(MISSES_KEY, 0),
+    }
+
+
+class GenerationMixin:
+    """Связывает представление с поколениями пространств имён.
+
+    `cache_namespaces` задаёт пространства имён, от которых зависит
+    ответ, `invalidates` - пространства, сбрасываемые при записи.
+    """
+
+    cache_namespaces = ()
+    invalidates = ()
+
+    def get_cache_namespaces(self):
+        return self.cache_namespaces
+
+    def get_invalidated_namespaces(self):
+        return self.invalidates
+
+    def get_generations(self):
+        # Кеш ответов и ETag одного запроса читают поколения один раз.
+        if not hasattr(self, '_generations'):
+            self._generations = '.'.join(
+                str(generation)
+                for generation in get_generations(self.get_cache_namespaces())
+            )
+        return self._generations
+
+    # В транзакции сброс из представления и из сигналов моделей
+    # выполняется одним запросом.
+    @transaction.atomic
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        invalidate(*self.get_invalidated_namespaces())
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        invalidate(*self.get_invalidated_namespaces())
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        invalidate(*self.get_invalidated_namespaces())
+
+
+class CachedResponseMixin(GenerationMixin):
+    """Кеширует данные ответов на безопасные запросы."""
+
+    def get_cache_key(self, request):
+        generations = self.get_generations()
+        url = md5(request.build_absolute_uri().encode()).hexdigest()
+        return RESPONSE_KEY.format(generations=generations, url=url)
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        cached = get_cache().get(key)
+        if cached is not None:
+            count(HITS_KEY)
+            data, status_code = cached
+            return Response(
+                data, status=status_code, headers={'X-Cache': 'HIT'}
+            )
+        count(MISSES_KEY)
+        response = handler(request, *args, **kwargs)
+        get_cache().set(
+            key,
+            (response.data, response.status_code),
+            settings.API_CACHE_TIMEOUT
+        )
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class CachedListMixin(CachedResponseMixin):
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class CachedRetrieveMixin(CachedResponseMixin):
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ConditionalGetMixin(GenerationMixin):
+    """Отвечает 304 на If-None-Match, не обращаясь к строкам в БД.
+
+    ETag вычисляется до выполнения запроса, поэтому запись, совпавшая
+    с чтением, может лишь заставить клиента загрузить ответ повторно.
+    """
+
+    def get_etag(self, request):
+        source = ':'.join((
+            self.get_generations(),
+            request.build_absolute_uri(),
+            request.accepted_media_type,
+        ))
+        return quote_etag(md5(source.encode()).hexdigest())
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag}
+            )
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
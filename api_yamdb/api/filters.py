@@ -1,4 +1,7 @@
 import django_filters
+from django.db.models import F
+from rest_framework import filters
+
 from reviews.models import Title
 
 
@@ -8,7 +11,36 @@ class TitleFilter(django_filters.FilterSet):
     year = django_filters.NumberFilter(field_name='year')
     category = django_filters.CharFilter(field_name='category__slug')
     genre = django_filters.CharFilter(field_name='genre__slug')
+    rating_min = django_filters.NumberFilter(
+        field_name='rating', lookup_expr='gte'
+    )
+    rating_max = django_filters.NumberFilter(
+        field_name='rating', lookup_expr='lte'
+    )
 
     class Meta:
         model = Title
         fields = ('name', 'year', 'category__slug', 'genre__slug')
+
+
+class TitleOrderingFilter(filters.OrderingFilter):
+    """Сортировка произведений с устойчивым порядком равных значений.
+
+    Произведения без рейтинга идут последними, а при равных значениях
+    порядок задаёт id в том же направлении: так `-rating` читается
+    из индекса title_rating_idx без сортировки.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        result = [
+            F('rating').desc(nulls_last=True) if field == '-rating'
+            else F('rating').asc(nulls_last=True) if field == 'rating'
+            else field
+            for field in ordering
+        ]
+        if not {'id', '-id'} & set(ordering):
+            result.append('-id' if ordering[-1].startswith('-') else 'id')
+        return result
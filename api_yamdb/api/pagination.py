@@ -0,0 +1,11 @@
+from rest_framework.pagination import CursorPagination
+
+
+class FeedCursorPagination(CursorPagination):
+    """Курсорная пагинация лент отзывов и комментариев.
+
+    Страница выбирается по позиции в индексе (-pub_date, id),
+    без COUNT(*) и OFFSET-сканирования предыдущих страниц.
+    """
+
+    ordering = ('-pub_date', 'id')
@@ -16,9 +16,10 @@ class IsAuthorOrModeratorOrReadOnly(permissions.BasePermission):
         )
 
     def has_object_permission(self, request, view, obj):
+        # Сравнение по ключу не загружает автора объекта из БД.
         return (
             request.method in permissions.SAFE_METHODS
-            or obj.author == request.user
+            or obj.author_id == request.user.id
             or (
                 request.user.is_authenticated
                 and (
@@ -0,0 +1,69 @@
+"""JSON-рендерер и парсер на orjson с откатом на стандартный json.
+
+orjson сериализует данные сериализаторов в несколько раз быстрее
+стандартного json. Если библиотека не установлена, выключена настройкой
+API_ORJSON или запрошен ответ с отступами, используются рендерер
+и парсер DRF. В отличие от них orjson выводит NaN и бесконечность
+как null.
+"""
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Даты и время форматирует кодировщик DRF, чтобы вывод совпадал
+# с JSONRenderer.
+OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    if orjson is not None else 0
+)
+
+
+def orjson_enabled():
+    return orjson is not None and settings.API_ORJSON
+
+
+class ORJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (
+            not orjson_enabled()
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+        try:
+            rendered = orjson.dumps(
+                data, default=self.encoder_class().default, option=OPTIONS
+            )
+        except orjson.JSONEncodeError:
+            # Например, целые числа длиннее 64 бит.
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+        # Как и JSONRenderer, экранируем U+2028 и U+2029 для JavaScript.
+        return rendered.replace(
+            '\u2028'.encode(), b'\\u2028'
+        ).replace('\u2029'.encode(), b'\\u2029')
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if not orjson_enabled() or encoding.lower() not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -1,17 +1,50 @@
 
 from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
-from rest_framework import serializers
-from rest_framework.exceptions import ValidationError
+from rest_framework import permissions, serializers
 from rest_framework.relations import SlugRelatedField
 
 from reviews.constants import (
-    MAX_LENGTH_EMAIL, MAX_LENGTH_USERNAME, MAX_VALUE_SCORE, MIN_VALUE_SCORE
+    MAX_LENGTH_EMAIL, MAX_LENGTH_SLUG, MAX_LENGTH_USERNAME, MAX_VALUE_SCORE,
+    MIN_VALUE_SCORE
 )
-from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.models import (
+    Category, CategoryStatistics, Comment, Genre, GenreStatistics, Review,
+    Title, User
+)
+from reviews.search import KINDS
 from reviews.validators import validate_username, validate_year
 
 
+def get_requested_fields(request, fields):
+    """Поля ответа, оставленные параметрами запроса `fields` и `omit`."""
+    params = request.query_params
+    if 'fields' in params:
+        requested = set(params['fields'].split(','))
+        fields = [field for field in fields if field in requested]
+    if 'omit' in params:
+        omitted = set(params['omit'].split(','))
+        fields = [field for field in fields if field not in omitted]
+    return fields
+
+
+class SparseFieldsMixin:
+    """Оставляет в ответе на безопасный запрос только запрошенные поля.
+
+    Например, `?fields=id,name,rating` или `?omit=description`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in permissions.SAFE_METHODS:
+            return
+        requested = set(get_requested_fields(request, self.fields))
+        for field in list(self.fields):
+            if field not in requested:
+                self.fields.pop(field)
+
+
 class GenreSerializer(serializers.ModelSerializer):
     """Сериализатор жанра."""
 
@@ -28,12 +61,36 @@ class CategorySerializer(serializers.ModelSerializer):
         exclude = ('id',)
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class GenreStatisticsSerializer(serializers.ModelSerializer):
+    """Сериализатор показателей жанра."""
+
+    name = serializers.CharField(source='genre.name')
+    slug = serializers.CharField(source='genre.slug')
+
+    class Meta:
+        model = GenreStatistics
+        fields = (
+            'name', 'slug', 'title_count', 'review_count', 'mean_rating',
+            'top_titles', 'refreshed_at'
+        )
+
+
+class CategoryStatisticsSerializer(GenreStatisticsSerializer):
+    """Сериализатор показателей категории."""
+
+    name = serializers.CharField(source='category.name')
+    slug = serializers.CharField(source='category.slug')
+
+    class Meta(GenreStatisticsSerializer.Meta):
+        model = CategoryStatistics
+
+
+class TitleReadSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор произведений под безопасные запросы."""
 
     genre = GenreSerializer(many=True)
     category = CategorySerializer()
-    rating = serializers.IntegerField(required=False)
+    rating = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Title
@@ -56,7 +113,7 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         queryset=Category.objects.all()
     )
     year = serializers.IntegerField(validators=[validate_year])
-    rating = serializers.IntegerField(required=False)
+    rating = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Title
@@ -68,7 +125,22 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         return TitleReadSerializer(instance).data
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class TitleBulkSerializer(TitleWriteSerializer):
+    """Элемент пакета произведений.
+
+    С `id` элемент обновляет существующее произведение, без него -
+    создаёт новое. Слаги жанров и категорий проверяются одним
+    запросом на весь пакет.
+    """
+
+    id = serializers.IntegerField(required=False)
+    genre = serializers.ListField(
+        child=serializers.SlugField(max_length=MAX_LENGTH_SLUG)
+    )
+    category = serializers.SlugField(max_length=MAX_LENGTH_SLUG)
+
+
+class ReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор отзыва."""
 
     author = serializers.SlugRelatedField(
@@ -87,21 +159,8 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         fields = ('id', 'text', 'author', 'score', 'pub_date')
 
-    def validate(self, attrs):
-        """Проверка уникальности отзыва."""
-        request = self.context.get('request')
-        if (
-            request and request.method == 'POST' and Review.objects.filter(
-                author=request.user,
-                title_id=self.context['view'].kwargs['title_id']).exists()
-        ):
-            raise ValidationError(
-                'Вы уже оставляли отзыв на это произведение.'
-            )
-        return attrs
-
-
-class CommentSerializer(serializers.ModelSerializer):
+
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор комментария."""
 
     author = SlugRelatedField(slug_field='username', read_only=True)
@@ -111,7 +170,33 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'pub_date')
 
 
-class UserSerializer(serializers.ModelSerializer):
+class ReviewBulkSerializer(ReviewSerializer):
+    """Элемент пакета отзывов.
+
+    Автор и произведение передаются ключами и разрешаются одним
+    запросом на весь пакет, а не отдельно для каждого элемента.
+    """
+
+    author = serializers.CharField(
+        max_length=MAX_LENGTH_USERNAME,
+        required=False
+    )
+    title = serializers.IntegerField(source='title_id', required=False)
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ReviewSerializer.Meta.fields + ('title',)
+
+
+class CommentBulkSerializer(CommentSerializer):
+    """Элемент пакета комментариев."""
+
+    author = serializers.CharField(
+        max_length=MAX_LENGTH_USERNAME,
+        required=False
+    )
+
+
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
     class Meta:
         model = User
@@ -156,3 +241,21 @@ class ObtainJWTSerializer(serializers.Serializer):
         required=True,
         validators=[validate_username]
     )
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=256, required=True)
+    type = serializers.MultipleChoiceField(
+        choices=KINDS,
+        required=False
+    )
+    page = serializers.IntegerField(min_value=1, default=1)
+
+
+class SearchResultSerializer(serializers.Serializer):
+    type = serializers.CharField()
+    id = serializers.IntegerField()
+    title_id = serializers.IntegerField()
+    review_id = serializers.IntegerField(allow_null=True)
+    snippet = serializers.CharField()
+    rank = serializers.FloatField()
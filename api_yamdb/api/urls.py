@@ -1,10 +1,13 @@
 """Модуль с маршрутизацией приложения api."""
+from django.conf import settings
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from .async_views import make_async
 from .views import (
     CategoryViewSet, GenreViewSet, ReviewViewSet, TitleViewSet,
-    CommentViewSet, UserViewSet, obtain_jwt_view, sign_up_view,
+    CommentViewSet, UserViewSet, cache_stats_view, obtain_jwt_view,
+    review_bulk_view, search_view, sign_up_view,
 )
 
 app_name = 'api'
@@ -25,6 +28,10 @@ router_v1.register(
 )
 router_v1.register('users', UserViewSet, basename='users')
 
+router_v1_urls = router_v1.urls
+if settings.ASYNC_READ_VIEWS:
+    router_v1_urls = make_async(router_v1_urls)
+
 
 auth_url_patterns = [
     path('signup/', sign_up_view),
@@ -33,6 +40,9 @@ auth_url_patterns = [
 
 
 urlpatterns = [
-    path('v1/', include(router_v1.urls)),
+    path('v1/', include(router_v1_urls)),
     path('v1/auth/', include(auth_url_patterns)),
+    path('v1/cache/stats/', cache_stats_view),
+    path('v1/search/', search_view),
+    path('v1/reviews/bulk/', review_bulk_view),
 ]
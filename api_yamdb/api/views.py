@@ -2,8 +2,7 @@
 import random
 
 from django.conf import settings
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import transaction
 from django.db.utils import IntegrityError
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
@@ -11,22 +10,36 @@ from rest_framework import filters, mixins, permissions, status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
-
-from api.filters import TitleFilter
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from api.authentication import get_token_for_user
+from api.bulk import CommentBulkCreator, ReviewBulkCreator, TitleBulkCreator
+from api.cache import (
+    CachedListMixin, CachedRetrieveMixin, ConditionalGetMixin, get_stats,
+    invalidate
+)
+from api.filters import TitleFilter, TitleOrderingFilter
+from api.pagination import FeedCursorPagination
 from api.permissions import (
     AdminOnly, IsAuthorOrModeratorOrReadOnly, ReadOnlyOrAdmin
 )
-from reviews.models import Category, Genre, Review, Title, User
+from reviews.models import Category, Comment, Genre, Review, Title, User
+from reviews.outbox import enqueue_email
+from reviews.search import KINDS, search
+from reviews.statistics import GROUPS, get_statistics
 from api.serializers import (
-    CategorySerializer, CommentSerializer, GenreSerializer,
-    ObtainJWTSerializer, ReviewSerializer, SignUpSerializer,
-    TitleReadSerializer, TitleWriteSerializer,
-    UserSerializer, UserProfileSerializer
+    CategorySerializer, CategoryStatisticsSerializer, CommentSerializer,
+    GenreSerializer, GenreStatisticsSerializer,
+    ObtainJWTSerializer, ReviewSerializer, SearchQuerySerializer,
+    SearchResultSerializer, SignUpSerializer, TitleReadSerializer,
+    TitleWriteSerializer, UserSerializer, UserProfileSerializer,
+    get_requested_fields
 )
 
 
 class BaseCRDSlugSeachViewset(
+    CachedListMixin,
     viewsets.GenericViewSet,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
@@ -37,79 +50,306 @@ class BaseCRDSlugSeachViewset(
     search_fields = ('name',)
     lookup_field = 'slug'
     http_method_names = ['get', 'post', 'patch', 'delete']
+    statistics_serializer_class = None
+
+    def get_statistics_queryset(self):
+        model = self.queryset.model
+        return GROUPS[model].objects.select_related(model._meta.model_name)
+
+    @action(detail=True, methods=['GET'])
+    def statistics(self, request, slug):
+        """Сохранённые показатели жанра или категории."""
+        statistics = self.get_statistics_queryset().filter(**{
+            f'{self.queryset.model._meta.model_name}__slug': slug
+        }).first()
+        if statistics is None:
+            statistics = get_statistics(self.get_object())
+        return Response(
+            self.statistics_serializer_class(statistics).data,
+            status=status.HTTP_200_OK
+        )
+
+    @action(
+        detail=False,
+        methods=['GET'],
+        url_path=settings.STATISTICS_URL,
+        url_name='statistics-list'
+    )
+    def statistics_list(self, request):
+        """Показатели всех жанров или категорий."""
+        page = self.paginate_queryset(self.get_statistics_queryset())
+        return self.get_paginated_response(
+            self.statistics_serializer_class(page, many=True).data
+        )
 
 
 class GenreViewSet(BaseCRDSlugSeachViewset):
     """Представление жанра."""
 
     serializer_class = GenreSerializer
+    statistics_serializer_class = GenreStatisticsSerializer
     queryset = Genre.objects.all()
+    cache_namespaces = ('genres',)
+    invalidates = ('genres', 'titles')
 
 
 class CategoryViewSet(BaseCRDSlugSeachViewset):
     """Представление категории."""
 
     serializer_class = CategorySerializer
+    statistics_serializer_class = CategoryStatisticsSerializer
     queryset = Category.objects.all()
-
-
-class TitleViewSet(viewsets.ModelViewSet):
+    cache_namespaces = ('categories',)
+    invalidates = ('categories', 'titles')
+
+
+class SparseQuerysetMixin:
+    """Не загружает колонки и связи, которых нет в ответе.
+
+    `sparse_fields` сопоставляет полю ответа пути для `only()`: путь
+    через `__` добавляет `select_related`, а `sparse_prefetch` задаёт
+    связи для `prefetch_related`. Колонки `required_columns` нужны
+    представлению при любом наборе полей.
+    """
+
+    sparse_fields = {}
+    sparse_prefetch = {}
+    required_columns = ()
+
+    def get_response_fields(self):
+        if self.request.method not in permissions.SAFE_METHODS:
+            return list(self.sparse_fields)
+        return get_requested_fields(self.request, list(self.sparse_fields))
+
+    def prune_queryset(self, queryset):
+        fields = self.get_response_fields()
+        paths = [
+            path for field in fields for path in self.sparse_fields[field]
+        ]
+        queryset = queryset.select_related(None).prefetch_related(None)
+        relations = {path.split('__')[0] for path in paths if '__' in path}
+        if relations:
+            queryset = queryset.select_related(*relations)
+        prefetch = [
+            self.sparse_prefetch[field] for field in fields
+            if field in self.sparse_prefetch
+        ]
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset.only('id', *self.required_columns, *paths)
+
+
+class TitleViewSet(
+    ConditionalGetMixin,
+    CachedListMixin,
+    CachedRetrieveMixin,
+    SparseQuerysetMixin,
+    viewsets.ModelViewSet
+):
     """Представление произведения."""
 
-    queryset = Title.objects.all().annotate(
-        rating=Avg('reviews__score')
-    ).order_by(*Title._meta.ordering)
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre')
     permission_classes = (ReadOnlyOrAdmin,)
-    filter_backends = (DjangoFilterBackend, filters.OrderingFilter)
+    filter_backends = (DjangoFilterBackend, TitleOrderingFilter)
     filterset_class = TitleFilter
+    ordering_fields = ('id', 'name', 'year', 'rating')
     http_method_names = ['get', 'post', 'patch', 'delete']
+    cache_namespaces = ('titles',)
+    invalidates = ('titles',)
+    sparse_fields = {
+        'id': (),
+        'name': ('name',),
+        'year': ('year',),
+        'description': ('description',),
+        'genre': (),
+        'category': ('category__name', 'category__slug'),
+        'rating': ('rating',),
+    }
+    sparse_prefetch = {'genre': 'genre'}
 
     def get_serializer_class(self):
         if self.request.method in permissions.SAFE_METHODS:
             return TitleReadSerializer
         return TitleWriteSerializer
 
+    def get_queryset(self):
+        if self.request.method in permissions.SAFE_METHODS:
+            return self.prune_queryset(super().get_queryset())
+        # Рейтинг меняется только отзывами: не загруженные поля
+        # не попадут в UPDATE и не затрут параллельные изменения.
+        return super().get_queryset().defer(
+            'rating_sum', 'rating_count', 'rating'
+        )
+
+    @action(detail=False, methods=['POST'])
+    def bulk(self, request):
+        """Пакетное создание и обновление произведений."""
+        return TitleBulkCreator(request).create(request.data)
+
+
+class CursorFeedMixin:
+    """Включает курсорную пагинацию, если в запросе передан `cursor`."""
+
+    @property
+    def pagination_class(self):
+        if (
+            FeedCursorPagination.cursor_query_param
+            in self.request.query_params
+        ):
+            return FeedCursorPagination
+        return api_settings.DEFAULT_PAGINATION_CLASS
 
-class ReviewViewSet(viewsets.ModelViewSet):
+
+class ReviewViewSet(
+    ConditionalGetMixin, CursorFeedMixin, SparseQuerysetMixin,
+    viewsets.ModelViewSet
+):
     """Представление отзыва."""
 
     http_method_names = ['get', 'post', 'patch', 'delete']
     serializer_class = ReviewSerializer
     permission_classes = (IsAuthorOrModeratorOrReadOnly,)
+    # Автор приходит в том же запросе, без отдельного запроса на
+    # каждую строку; произведение нужно при изменении рейтинга.
+    sparse_fields = {
+        'id': (),
+        'text': ('text',),
+        'author': ('author__username',),
+        'score': ('score',),
+        'pub_date': ('pub_date',),
+    }
+    # По pub_date курсорная пагинация строит ссылки на соседние страницы.
+    required_columns = ('title', 'score', 'author', 'pub_date')
+
+    def get_cache_namespaces(self):
+        return (f'reviews:{self.kwargs["title_id"]}', 'users')
 
     def get_title_or_404(self):
-        return get_object_or_404(Title, id=self.kwargs['title_id'])
+        """Произведение из URL, загружаемое один раз за запрос."""
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(Title, id=self.kwargs['title_id'])
+        return self._title
 
     def get_queryset(self):
-        return self.get_title_or_404().reviews.all()
+        if self.action == 'list':
+            queryset = self.get_title_or_404().reviews.all()
+        else:
+            # Отзыв ищется сразу по произведению из URL, без его загрузки.
+            queryset = Review.objects.filter(title_id=self.kwargs['title_id'])
+        return self.prune_queryset(queryset)
 
     def perform_create(self, serializer):
-        serializer.save(
-            author=self.request.user,
-            title=self.get_title_or_404()
+        title = self.get_title_or_404()
+        # Уникальность отзыва проверяет ограничение unique_title_author
+        # при вставке: без лишнего запроса и без гонки параллельных POST.
+        # Запрос существующего отзыва выполняется только после ошибки.
+        try:
+            with transaction.atomic():
+                review = serializer.save(author=self.request.user, title=title)
+                Title.objects.filter(id=title.id).shift_rating(review.score, 1)
+                invalidate('titles', f'reviews:{title.id}')
+        except IntegrityError:
+            # Другие нарушения (например, произведение удалили
+            # параллельно) не выдаются за повторный отзыв.
+            if not Review.objects.filter(
+                title_id=title.id, author_id=self.request.user.id
+            ).exists():
+                raise
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                'Вы уже оставляли отзыв на это произведение.'
+            ]})
+
+    @action(detail=False, methods=['POST'])
+    def bulk(self, request, title_id):
+        """Пакетное создание отзывов к произведению."""
+        return ReviewBulkCreator(
+            request, title=self.get_title_or_404()
+        ).create(request.data)
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        old_score = serializer.instance.score
+        review = serializer.save()
+        invalidate(f'reviews:{review.title_id}')
+        if review.score != old_score:
+            Title.objects.filter(id=review.title_id).shift_rating(
+                review.score - old_score
+            )
+            invalidate('titles')
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        Title.objects.filter(id=instance.title_id).shift_rating(
+            -instance.score, -1
         )
+        invalidate('titles', f'reviews:{instance.title_id}')
+        instance.delete()
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    ConditionalGetMixin, CursorFeedMixin, SparseQuerysetMixin,
+    viewsets.ModelViewSet
+):
     """Представление комментария."""
 
     http_method_names = ['get', 'post', 'patch', 'delete']
     serializer_class = CommentSerializer
     permission_classes = (IsAuthorOrModeratorOrReadOnly,)
+    sparse_fields = {
+        'id': (),
+        'text': ('text',),
+        'author': ('author__username',),
+        'pub_date': ('pub_date',),
+    }
+    required_columns = ('review', 'author', 'pub_date')
+
+    def get_cache_namespaces(self):
+        return (
+            f'reviews:{self.kwargs["title_id"]}',
+            f'comments:{self.kwargs["review_id"]}',
+            'users',
+        )
+
+    def get_invalidated_namespaces(self):
+        return (f'comments:{self.kwargs["review_id"]}',)
 
     def get_review_or_404(self):
-        return get_object_or_404(Review, id=self.kwargs['review_id'])
+        """Отзыв из URL, принадлежащий произведению из URL."""
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review,
+                id=self.kwargs['review_id'],
+                title_id=self.kwargs['title_id']
+            )
+        return self._review
 
     def get_queryset(self):
         """Переопределяет метод для фильтрации комментариев."""
-        return self.get_review_or_404().comments.all()
+        if self.action == 'list':
+            queryset = self.get_review_or_404().comments.all()
+        else:
+            queryset = Comment.objects.filter(
+                review_id=self.kwargs['review_id'],
+                review__title_id=self.kwargs['title_id']
+            )
+        return self.prune_queryset(queryset)
 
     def perform_create(self, serializer):
+        # Кеш комментариев сбрасывает сигнал сохранения модели.
         serializer.save(
             author=self.request.user,
             review=self.get_review_or_404()
         )
 
+    @action(detail=False, methods=['POST'])
+    def bulk(self, request, title_id, review_id):
+        """Пакетное создание комментариев к отзыву."""
+        return CommentBulkCreator(
+            request, review=self.get_review_or_404()
+        ).create(request.data)
+
 
 def make_and_send_confirmation_code(user, serializer):
     user.confirmation_code = ''.join(
@@ -118,17 +358,17 @@ def make_and_send_confirmation_code(user, serializer):
             k=settings.CONFIRMATION_CODE_LENGTH
         )
     )
-    user.save()
-    send_mail(
-        'Код подтверждения',
-        f'Ваш код подтверждения: {user.confirmation_code}',
-        settings.SENDER_EMAIL,
-        [user.email]
-    )
+    with transaction.atomic():
+        user.save()
+        enqueue_email(
+            'Код подтверждения',
+            f'Ваш код подтверждения: {user.confirmation_code}',
+            user.email
+        )
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """Представление для операций с пользователями."""
 
     queryset = User.objects.all()
@@ -138,6 +378,29 @@ class UserViewSet(viewsets.ModelViewSet):
     lookup_field = 'username'
     search_fields = ('username',)
     http_method_names = ['get', 'post', 'patch', 'delete']
+    sparse_fields = {
+        field: (field,) for field in UserSerializer.Meta.fields
+    }
+
+    def get_queryset(self):
+        if self.request.method in permissions.SAFE_METHODS:
+            return self.prune_queryset(super().get_queryset())
+        return super().get_queryset()
+
+    def perform_update(self, serializer):
+        old_username = serializer.instance.username
+        user = serializer.save()
+        if user.username != old_username:
+            invalidate('users')
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        title_ids = list(instance.reviews.values_list('title_id', flat=True))
+        instance.delete()
+        invalidate('users')
+        if title_ids:
+            Title.objects.filter(id__in=title_ids).refresh_rating()
+            invalidate('titles')
 
     @action(
         detail=False,
@@ -148,19 +411,81 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def profile(self, request):
         """Представление профиля текущего пользователя."""
+        user = request.user
+        if user.get_deferred_fields():
+            # Пользователь из токена содержит только часть полей.
+            user = User.objects.get(pk=user.pk)
         if request.method != 'PATCH':
             return Response(
-                UserProfileSerializer(request.user).data,
+                UserProfileSerializer(
+                    user, context=self.get_serializer_context()
+                ).data,
                 status=status.HTTP_200_OK
             )
+        old_username = user.username
         serializer = UserProfileSerializer(
-            request.user, data=request.data, partial=True
+            user, data=request.data, partial=True
         )
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        user = serializer.save()
+        if user.username != old_username:
+            invalidate('users')
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+@api_view(['GET'])
+@permission_classes([AdminOnly])
+def cache_stats_view(request):
+    return Response(get_stats(), status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([AdminOnly])
+def review_bulk_view(request):
+    """Пакетное создание отзывов к разным произведениям."""
+    return ReviewBulkCreator(request).create(request.data)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def search_view(request):
+    """Полнотекстовый поиск по произведениям, отзывам и комментариям.
+
+    Страницы без подсчёта общего числа результатов: выбирается на одну
+    запись больше размера страницы, чтобы узнать о следующей.
+    """
+    serializer = SearchQuerySerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    page = serializer.validated_data['page']
+    page_size = api_settings.PAGE_SIZE
+    kinds = [
+        kind for kind in KINDS
+        if kind in (serializer.validated_data.get('type') or KINDS)
+    ]
+    results = search(
+        serializer.validated_data['q'],
+        kinds,
+        limit=page_size + 1,
+        offset=(page - 1) * page_size
+    )
+    url = request.build_absolute_uri()
+    previous = None
+    if page == 2:
+        previous = remove_query_param(url, 'page')
+    elif page > 2:
+        previous = replace_query_param(url, 'page', page - 1)
+    return Response({
+        'next': (
+            replace_query_param(url, 'page', page + 1)
+            if len(results) > page_size else None
+        ),
+        'previous': previous,
+        'results': SearchResultSerializer(
+            results[:page_size], many=True
+        ).data,
+    }, status=status.HTTP_200_OK)
+
+
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
 def sign_up_view(request):
@@ -195,6 +520,6 @@ def obtain_jwt_view(request):
             user.save()
         raise ValidationError('Неверный код подтверждения.')
     return Response(
-        {'token': str(AccessToken.for_user(user))},
+        {'token': str(get_token_for_user(user))},
         status=status.HTTP_200_OK
     )
@@ -0,0 +1,8 @@
+"""PostgreSQL с проверкой постоянного соединения перед первым запросом."""
+from django.db.backends.postgresql import base
+
+from api_yamdb.db import HealthCheckMixin
+
+
+class DatabaseWrapper(HealthCheckMixin, base.DatabaseWrapper):
+    pass
@@ -0,0 +1,60 @@
+"""Обслуживание соединений с БД."""
+from django.conf import settings
+from django.db import connections
+
+
+class HealthCheckMixin:
+    """Проверяет постоянное соединение, когда запрос впервые его использует.
+
+    Так же работает CONN_HEALTH_CHECKS в Django 4.1: соединения, которые
+    запрос не использует, не проверяются, а проверка выполняется
+    не чаще раза за запрос.
+    """
+
+    health_check_done = True
+
+    def ensure_connection(self):
+        if (
+            self.connection is not None
+            and not self.health_check_done
+            and not self.in_atomic_block
+        ):
+            self.health_check_done = True
+            if not self.is_usable():
+                self.close()
+        super().ensure_connection()
+
+
+def check_connections(**kwargs):
+    """Отмечает постоянные соединения для проверки в начале запроса.
+
+    Без проверки первый запрос после перезапуска сервера БД или
+    обрыва соединения завершился бы ошибкой. Django 3.2 проверяет
+    соединение только после ошибки в предыдущем запросе. Сама проверка
+    выполняется в HealthCheckMixin.ensure_connection.
+    """
+    if not settings.DB_HEALTH_CHECKS:
+        return
+    for connection in connections.all():
+        if (
+            isinstance(connection, HealthCheckMixin)
+            and connection.connection is not None
+            and connection.settings_dict['CONN_MAX_AGE'] != 0
+        ):
+            connection.health_check_done = False
+
+
+def set_sqlite_pragmas(sender, connection, **kwargs):
+    """Применяет settings.SQLITE_PRAGMAS к новому соединению с SQLite."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            if name == 'journal_mode':
+                # Режим журнала хранится в файле БД, а его смена требует
+                # монопольного доступа и без ожидания падает, пока открыты
+                # другие соединения.
+                cursor.execute('PRAGMA journal_mode')
+                if cursor.fetchone()[0] == str(value).lower():
+                    continue
+            cursor.execute(f'PRAGMA {name} = {value}')
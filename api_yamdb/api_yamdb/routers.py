@@ -0,0 +1,125 @@
+"""Чтение с реплик БД для безопасных запросов.
+
+Middleware выбирает для запроса GET, HEAD или OPTIONS одну случайную
+реплику из settings.DB_REPLICAS, и роутер направляет на неё все чтения
+запроса. Запись всегда идёт в `default`. После записи чтения до конца
+запроса тоже идут в `default`, а клиент (по заголовку Authorization) ещё
+DB_REPLICA_STICKY_SECONDS секунд читает с `default`, чтобы видеть свои
+изменения, пока они не дошли до реплик. Отметка о записи хранится
+в кеше DB_REPLICA_CACHE_ALIAS, общем для всех процессов.
+"""
+import asyncio
+import random
+from contextvars import ContextVar
+from hashlib import sha256
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+
+STICKY_KEY = 'db:sticky:{client}'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# Эти бэкенды не видят отметок, сделанных другими процессами.
+LOCAL_CACHES = (LocMemCache, DummyCache)
+
+_state = ContextVar('replica_state', default=None)
+
+
+class RequestState:
+
+    def __init__(self, use_replica):
+        # Все чтения запроса идут в одну БД и видят согласованные данные.
+        self.alias = (
+            random.choice(settings.DB_REPLICAS) if use_replica
+            else 'default'
+        )
+        self.wrote = False
+
+
+def get_sticky_cache():
+    return caches[settings.DB_REPLICA_CACHE_ALIAS]
+
+
+def get_sticky_key(request):
+    authorization = request.META.get('HTTP_AUTHORIZATION')
+    if not authorization:
+        return None
+    client = sha256(authorization.encode()).hexdigest()
+    return STICKY_KEY.format(client=client)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None:
+            return 'default'
+        return state.alias
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.alias = 'default'
+            state.wrote = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики содержат те же данные, что и `default`.
+        return True
+
+
+class ReplicaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if settings.DB_REPLICAS and isinstance(
+            get_sticky_cache(), LOCAL_CACHES
+        ):
+            raise ImproperlyConfigured(
+                'Для реплик DB_REPLICA_CACHE_ALIAS должен указывать на кеш, '
+                'общий для всех процессов (Redis, Memcached, БД).'
+            )
+        if asyncio.iscoroutinefunction(get_response):
+            # Под ASGI цепочка остаётся асинхронной, как у MiddlewareMixin.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def start(self, request):
+        key = get_sticky_key(request)
+        state = RequestState(
+            request.method in SAFE_METHODS
+            and (key is None or get_sticky_cache().get(key) is None)
+        )
+        return key, state, _state.set(state)
+
+    def finish(self, request, key, state, token):
+        _state.reset(token)
+        if key is not None and (
+            state.wrote or request.method not in SAFE_METHODS
+        ):
+            get_sticky_cache().set(
+                key, True, settings.DB_REPLICA_STICKY_SECONDS
+            )
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        if not settings.DB_REPLICAS:
+            return self.get_response(request)
+        key, state, token = self.start(request)
+        try:
+            return self.get_response(request)
+        finally:
+            self.finish(request, key, state, token)
+
+    async def __acall__(self, request):
+        if not settings.DB_REPLICAS:
+            return await self.get_response(request)
+        key, state, token = self.start(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            self.finish(request, key, state, token)
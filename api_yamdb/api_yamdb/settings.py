@@ -1,7 +1,11 @@
+import os
 import string
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # SECURITY WARNING: keep the secret key used in production secret!
@@ -33,6 +37,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api_yamdb.routers.ReplicaMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -65,14 +70,124 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 # Database
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# По умолчанию (DB_ENGINE=sqlite) используется файл SQLite,
+# DB_ENGINE=postgresql включает PostgreSQL с постоянными соединениями.
+# Пула соединений в Django 3.2 нет: каждый поток держит своё соединение
+# не дольше DB_CONN_MAX_AGE секунд, а общий пул для всех процессов даёт
+# PgBouncer (DB_PGBOUNCER=1).
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            # Проверяет постоянное соединение при первом запросе к БД.
+            'ENGINE': 'api_yamdb.backends.postgresql',
+            'NAME': os.getenv('POSTGRES_DB', 'api_yamdb'),
+            'USER': os.getenv('POSTGRES_USER', 'api_yamdb'),
+            'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+            # Серверные курсоры не переживают transaction pooling.
+            'DISABLE_SERVER_SIDE_CURSORS': (
+                os.getenv('DB_PGBOUNCER', '0') == '1'
+            ),
+            'OPTIONS': {
+                'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', 5)),
+            },
+        }
+    }
+elif DB_ENGINE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+        }
     }
+else:
+    raise ImproperlyConfigured(
+        f'Неизвестное значение DB_ENGINE: {DB_ENGINE!r}, '
+        f'ожидается sqlite или postgresql.'
+    )
+
+# Реплики для чтения: хосты PostgreSQL (DB_REPLICA_HOSTS) или файлы
+# SQLite (SQLITE_REPLICA_PATHS) через запятую. GET-запрос читает с одной
+# случайной реплики, клиент после записи ещё DB_REPLICA_STICKY_SECONDS
+# секунд читает с основной БД. Отметки о записи хранятся в кеше
+# DB_REPLICA_CACHE_ALIAS (см. CACHES): он должен быть общим для всех
+# процессов, с локальным кешем процесса middleware не запустится.
+if DB_ENGINE == 'postgresql':
+    REPLICA_FIELD, REPLICAS = 'HOST', os.getenv('DB_REPLICA_HOSTS', '')
+else:
+    REPLICA_FIELD, REPLICAS = 'NAME', os.getenv('SQLITE_REPLICA_PATHS', '')
+
+DB_REPLICAS = []
+for number, value in enumerate(filter(None, REPLICAS.split(','))):
+    DATABASES[f'replica{number}'] = {
+        **DATABASES['default'],
+        REPLICA_FIELD: value.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DB_REPLICAS.append(f'replica{number}')
+
+DATABASE_ROUTERS = ['api_yamdb.routers.ReplicaRouter']
+DB_REPLICA_STICKY_SECONDS = int(os.getenv('DB_REPLICA_STICKY_SECONDS', 5))
+DB_REPLICA_CACHE_ALIAS = 'replicas'
+
+# Проверять постоянное соединение PostgreSQL перед первым запросом к БД
+# в обработке HTTP-запроса и открывать новое, если сервер БД его разорвал.
+DB_HEALTH_CHECKS = os.getenv('DB_HEALTH_CHECKS', '1') == '1'
+
+# PRAGMA для каждого нового соединения с SQLite, применяются по порядку.
+# WAL позволяет читать во время записи, busy_timeout (мс) заставляет
+# ждать блокировку вместо ошибки "database is locked", поэтому задаётся
+# первым. Отрицательный cache_size задаётся в КиБ, mmap_size - в байтах.
+SQLITE_PRAGMAS = {
+    'busy_timeout': 5000,
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'cache_size': -20000,
+    'mmap_size': 128 * 1024 * 1024,
+    'temp_store': 'memory',
 }
 
 
+# Под ASGI GET-запросы к произведениям, отзывам и комментариям
+# выполняются в пуле потоков параллельно (см. api/async_views.py).
+# Под WSGI включать не нужно: каждый запрос и так получает свой поток.
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', '0') == '1'
+
+
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Отметки о записи для чтения с реплик. Файловый кеш общий для
+    # процессов одного сервера; для нескольких серверов задайте
+    # DB_REPLICA_CACHE_BACKEND и DB_REPLICA_CACHE_LOCATION общего
+    # бэкенда (Redis, Memcached). Кеш в БД не подходит: его бы читали
+    # с реплик.
+    DB_REPLICA_CACHE_ALIAS: {
+        'BACKEND': os.getenv(
+            'DB_REPLICA_CACHE_BACKEND',
+            'django.core.cache.backends.filebased.FileBasedCache'
+        ),
+        'LOCATION': os.getenv(
+            'DB_REPLICA_CACHE_LOCATION',
+            os.path.join(tempfile.gettempdir(), 'api_yamdb_replicas')
+        ),
+    },
+}
+
+# Кеш ответов API. Поколения для ключей и ETag хранятся в БД, поэтому
+# локальный кеш каждого процесса тоже сбрасывается после записи в другом;
+# общий бэкенд (Redis, Memcached) лишь повышает долю попаданий.
+API_CACHE_ALIAS = 'default'
+API_CACHE_TIMEOUT = 300
+
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -106,24 +221,62 @@ USE_TZ = True
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+# JSON API читается и пишется через orjson, если он установлен;
+# False возвращает стандартный json без правки списков выше.
+API_ORJSON = os.getenv('API_ORJSON', '1') == '1'
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Сколько секунд процесс доверяет прочитанному состоянию пользователя
+# (роль, блокировка) при аутентификации по токену с утверждениями.
+JWT_USER_STATE_TTL = 30
+JWT_USER_STATE_MAX_SIZE = 10000
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 SENDER_EMAIL = 'api_yamdb@ya.ru'
 
+# Очередь исходящих писем: письма отправляет команда send_emails.
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 60
+# На сколько секунд взятая в отправку пачка скрывается от других
+# отправителей. Если процесс упал, не сохранив результат, письма
+# после этого срока отправятся повторно.
+EMAIL_OUTBOX_LEASE = 300
+# Отправлять письмо сразу после постановки в очередь (для разработки).
+EMAIL_OUTBOX_EAGER = False
+
+# Пакетное создание объектов через API.
+BULK_MAX_ITEMS = 1000
+BULK_BATCH_SIZE = 500
+
+# Число лучших произведений в показателях жанров и категорий.
+STATISTICS_TOP_TITLES = 10
+# Адрес списка показателей; не может быть слагом жанра или категории.
+STATISTICS_URL = 'statistics'
+
 
 STATIC_URL = '/static/'
 
@@ -1,6 +1,9 @@
 from django.contrib import admin
 
-from reviews.models import Category, Title, Genre, Review, Comment, User
+from reviews.models import (
+    Category, CategoryStatistics, Title, Genre, GenreStatistics, Review,
+    Comment, OutboxEmail, User
+)
 
 empty_value_display = '-пусто-'
 
@@ -93,3 +96,30 @@ class CommentAdmin(admin.ModelAdmin):
 
     )
     search_fields = ('author', 'review')
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient',
+        'subject',
+        'created',
+        'sent_at',
+        'attempts',
+        'next_attempt_at'
+    )
+    search_fields = ('recipient',)
+    list_filter = ('sent_at',)
+    readonly_fields = ('created',)
+
+
+@admin.register(GenreStatistics, CategoryStatistics)
+class StatisticsAdmin(admin.ModelAdmin):
+    list_display = (
+        '__str__',
+        'title_count',
+        'review_count',
+        'mean_rating',
+        'refreshed_at'
+    )
+    readonly_fields = ('refreshed_at',)
@@ -0,0 +1,143 @@
+"""Поколения пространств имён для кеша ответов и ETag.
+
+Номер поколения пространства (`titles`, `reviews:<id>`, ...) хранится
+в БД и увеличивается после каждой фиксированной записи в его данные.
+Сохранение и удаление объектов через ORM (в том числе из админки)
+сбрасывает пространства сигналами. Массовые операции (`update()`,
+`bulk_create()`) сигналов не отправляют, поэтому их код вызывает
+`invalidate` сам.
+"""
+import time
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_init, post_save
+)
+from django.dispatch import receiver
+
+from .models import (
+    CacheGeneration, Category, Comment, Genre, Review, Title, User
+)
+
+NAMESPACES = {
+    Title: lambda title: ('titles',),
+    Title.genre.through: lambda link: ('titles',),
+    Genre: lambda genre: ('genres', 'titles'),
+    Category: lambda category: ('categories', 'titles'),
+    Review: lambda review: (f'reviews:{review.title_id}',),
+    Comment: lambda comment: (f'comments:{comment.review_id}',),
+    User: lambda user: ('users',),
+}
+
+
+def get_namespaces(objects):
+    """Пространства имён, которые зависят от объектов `objects`."""
+    return {
+        namespace
+        for obj in objects
+        for namespace in NAMESPACES[type(obj)](obj)
+    }
+
+
+def new_generation():
+    # Поколение, созданное заново (например, в новой БД при старом общем
+    # кеше), не должно совпасть ни с одним из ранее выданных.
+    return time.time_ns()
+
+
+def get_generations(namespaces):
+    """Номера поколений из БД; у ещё не менявшихся пространств - 0."""
+    generations = dict(CacheGeneration.objects.filter(
+        namespace__in=namespaces
+    ).values_list('namespace', 'generation'))
+    return [generations.get(name, 0) for name in namespaces]
+
+
+def bump_generations(*namespaces):
+    generations = CacheGeneration.objects.filter(namespace__in=namespaces)
+    if generations.update(
+        generation=F('generation') + 1
+    ) == len(set(namespaces)):
+        return
+    # Первая запись в пространство имён. Строку могли одновременно
+    # создать в другом процессе, поэтому после вставки номера
+    # увеличиваются ещё раз.
+    CacheGeneration.objects.bulk_create(
+        (
+            CacheGeneration(namespace=name, generation=new_generation())
+            for name in set(namespaces)
+        ),
+        ignore_conflicts=True
+    )
+    generations.update(generation=F('generation') + 1)
+
+
+class Invalidation:
+    """Пространства имён, сбрасываемые при фиксации транзакции."""
+
+    def __init__(self, namespaces):
+        self.namespaces = set(namespaces)
+
+    def __call__(self):
+        bump_generations(*self.namespaces)
+
+
+def invalidate(*namespaces):
+    """Сбрасывает кеш пространств имён после фиксации транзакции.
+
+    Все пространства одной транзакции сбрасываются одним запросом.
+    """
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        for _, callback in connection.run_on_commit:
+            if isinstance(callback, Invalidation):
+                callback.namespaces.update(namespaces)
+                return
+    transaction.on_commit(Invalidation(namespaces))
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=Comment)
+def object_changed(sender, instance, **kwargs):
+    invalidate(*get_namespaces([instance]))
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    # Без этого список отзывов удалённого произведения без отзывов
+    # отвечал бы 304 вместо 404.
+    invalidate('titles', f'reviews:{instance.pk}')
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate('titles')
+
+
+@receiver(post_init, sender=User)
+def remember_username(sender, instance, **kwargs):
+    # Отложенное поле не загружается ради сравнения.
+    instance._saved_username = instance.__dict__.get('username')
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    # Имя автора выводится в отзывах и комментариях, а у нового
+    # пользователя их ещё нет.
+    if not created and instance.username != instance._saved_username:
+        invalidate('users')
+    instance._saved_username = instance.username
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    invalidate('users')
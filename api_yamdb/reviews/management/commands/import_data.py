@@ -0,0 +1,204 @@
+import csv
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DatabaseError, connection, transaction
+
+from reviews.generations import get_namespaces, invalidate
+from reviews.models import Category, Comment, Genre, Review, Title, User
+
+logging.basicConfig(
+    level=logging.INFO, format=('%(asctime)s - %(levelname)s - %(message)s')
+)
+
+DATA_DIR = os.path.join(settings.BASE_DIR, 'static', 'data')
+STATE_FILE = os.path.join(settings.BASE_DIR, 'import_data.state.json')
+FILE_MODEL = (
+    ('users.csv', User),
+    ('category.csv', Category),
+    ('genre.csv', Genre),
+    ('titles.csv', Title),
+    ('genre_title.csv', Title.genre.through),
+    ('review.csv', Review),
+    ('comments.csv', Comment),
+)
+DEFAULT_VALUES = {
+    User: {'password': make_password(None)},
+}
+MESSAGE = (
+    'Импорт из файла {path} в таблицу {table} осуществлен: '
+    '{rows} строк, {rate:.0f} строк/с.'
+)
+
+
+def get_columns(model, header):
+    """Сопоставляет колонкам CSV поля модели (`author` -> `author_id`)."""
+    return [model._meta.get_field(column) for column in header]
+
+
+def make_object(model, fields, row, defaults):
+    values = dict(defaults)
+    for field, value in zip(fields, row):
+        if value == '' and field.null:
+            values[field.attname] = None
+        else:
+            values[field.attname] = field.to_python(value)
+    return model(**values)
+
+
+def read_chunks(path, skip, chunk_size):
+    """Читает CSV частями, не загружая файл в память целиком."""
+    with open(path, encoding='utf-8', newline='') as file:
+        reader = csv.reader(file)
+        header = next(reader)
+        rows = islice(reader, skip, None)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield header, chunk
+
+
+@contextmanager
+def keep_auto_now_add(model):
+    """Сохраняет даты из файла вместо подстановки текущего времени."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Потоковый импорт данных из файлов: users.csv, category.csv, '
+        'genre.csv, titles.csv, genre_title.csv, review.csv, comments.csv '
+        'в настроенную БД с возможностью продолжить прерванный импорт'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=DATA_DIR,
+            help='Каталог с CSV файлами.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Число строк, записываемых в БД за одну транзакцию.'
+        )
+        parser.add_argument(
+            '--state',
+            default=STATE_FILE,
+            help='Файл с прогрессом импорта для продолжения после сбоя.'
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Начать импорт заново, не учитывая сохранённый прогресс.'
+        )
+
+    def load_state(self, path, restart):
+        if restart or not os.path.exists(path):
+            return {}
+        with open(path, encoding='utf-8') as file:
+            state = json.load(file)
+        logging.info(f'Продолжение импорта с сохранённого места: {state}')
+        return state
+
+    def save_state(self, path, state):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(state, file)
+
+    def insert(self, model, objects):
+        """Записывает строки части и возвращает, сколько их есть в БД."""
+        if not self.replay:
+            model.objects.bulk_create(objects)
+            return len(objects)
+        # Первая часть после продолжения могла быть зафиксирована
+        # до сбоя, но не записана в прогресс: готовые строки пропускаются.
+        model.objects.bulk_create(objects, ignore_conflicts=True)
+        return model.objects.filter(
+            pk__in={obj.pk for obj in objects}
+        ).count()
+
+    def import_file(self, path, model, state, options):
+        name = os.path.basename(path)
+        done = state.get(name, 0)
+        started = time.monotonic()
+        imported = 0
+        with keep_auto_now_add(model):
+            for header, chunk in read_chunks(
+                path, done, options['batch_size']
+            ):
+                fields = get_columns(model, header)
+                defaults = DEFAULT_VALUES.get(model, {})
+                lines = f'{done + 2}-{done + len(chunk) + 1}'
+                try:
+                    objects = [
+                        make_object(model, fields, row, defaults)
+                        for row in chunk
+                    ]
+                    with transaction.atomic():
+                        inserted = self.insert(model, objects)
+                        # bulk_create не отправляет сигналы моделей.
+                        invalidate(*get_namespaces(objects))
+                except (DatabaseError, ValidationError) as error:
+                    raise CommandError(
+                        f'Ошибка импорта {name} в строках {lines}: {error}'
+                    )
+                if inserted != len(chunk):
+                    raise CommandError(
+                        f'Ошибка импорта {name} в строках {lines}: '
+                        f'в БД {inserted} строк из {len(chunk)} прочитанных.'
+                    )
+                self.replay = False
+                done += len(chunk)
+                imported += len(chunk)
+                state[name] = done
+                self.save_state(options['state'], state)
+        logging.info(MESSAGE.format(
+            path=path,
+            table=model._meta.db_table,
+            rows=imported,
+            rate=imported / max(time.monotonic() - started, 1e-6)
+        ))
+        return imported
+
+    def handle(self, *args, **options):
+        state = self.load_state(options['state'], options['restart'])
+        self.replay = bool(state)
+        imported = {}
+        for filename, model in FILE_MODEL:
+            path = os.path.join(options['path'], filename)
+            if not os.path.exists(path):
+                logging.warning(f'Файл {path} не найден, пропускаем.')
+                continue
+            imported[model] = self.import_file(path, model, state, options)
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                no_style(), list(imported)
+            ):
+                cursor.execute(sql)
+        with transaction.atomic():
+            Title.objects.refresh_rating()
+            invalidate('titles')
+        if os.path.exists(options['state']):
+            os.remove(options['state'])
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from reviews.generations import invalidate
+from reviews.models import Title
+
+MISMATCH = (
+    'Произведение {id}: сохранено {rating_sum}/{rating_count}, '
+    'по отзывам {actual_sum}/{actual_count}.'
+)
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Проверка и пересчёт сохранённого рейтинга произведений '
+        '(rating_sum, rating_count, rating) по отзывам.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить рейтинг, ничего не изменяя.'
+        )
+
+    def handle(self, *args, **options):
+        mismatched = Title.objects.annotate(
+            actual_sum=Sum('reviews__score'),
+            actual_count=Count('reviews'),
+        ).exclude(
+            Q(rating_count=0, actual_count=0)
+            | Q(rating_sum=F('actual_sum'), rating_count=F('actual_count'))
+        ).values(
+            'id', 'rating_sum', 'rating_count', 'actual_sum', 'actual_count'
+        )
+        mismatched = list(mismatched)
+        for title in mismatched:
+            self.stdout.write(MISMATCH.format(**title))
+        if options['check']:
+            if mismatched:
+                raise CommandError(
+                    f'Рейтинг расходится у {len(mismatched)} произведений.'
+                )
+            self.stdout.write('Рейтинг всех произведений актуален.')
+            return
+        with transaction.atomic():
+            updated = Title.objects.refresh_rating()
+            invalidate('titles')
+        self.stdout.write(f'Рейтинг пересчитан для {updated} произведений.')
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.models import Category, Genre
+from reviews.statistics import refresh_statistics
+
+MESSAGE = (
+    'Пересчитаны показатели жанров: {genres}, категорий: {categories} '
+    'за {seconds:.2f} с.'
+)
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Пересчёт показателей жанров и категорий: количества произведений '
+        'и отзывов, среднего рейтинга и лучших произведений.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Работать постоянно, пересчитывая каждые --interval с.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=300,
+            help='Пауза между пересчётами, с.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            genres = refresh_statistics(Genre)
+            categories = refresh_statistics(Category)
+            self.stdout.write(MESSAGE.format(
+                genres=genres,
+                categories=categories,
+                seconds=time.monotonic() - started
+            ))
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
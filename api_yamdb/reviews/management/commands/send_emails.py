@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.outbox import get_pending_emails, send_pending_emails
+
+STATS = (
+    'Отправлено: {sent}, ошибок: {failed}, в очереди: {pending}, '
+    '{rate:.1f} писем/с.'
+)
+
+
+class Command(BaseCommand):
+
+    help = 'Отправка писем из очереди исходящих писем.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Число писем, отправляемых через одно соединение.'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Работать постоянно, проверяя очередь каждые --interval с.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза между проверками пустой очереди, с.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            sent_total = failed_total = 0
+            while True:
+                sent, failed = send_pending_emails(options['batch_size'])
+                sent_total += sent
+                failed_total += failed
+                if not sent and not failed:
+                    break
+            if sent_total or failed_total or not options['loop']:
+                self.stdout.write(STATS.format(
+                    sent=sent_total,
+                    failed=failed_total,
+                    pending=get_pending_emails().count(),
+                    rate=sent_total / (time.monotonic() - started),
+                ))
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,58 @@
+# Generated by Django 3.2 on 2026-10-18 04:54
+
+from django.db import migrations, models
+from django.db.models import (
+    Count, ExpressionWrapper, FloatField, OuterRef, Subquery, Sum
+)
+from django.db.models.functions import Cast, Coalesce
+
+
+def fill_rating(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    score_sum = Subquery(reviews.annotate(total=Sum('score')).values('total'))
+    score_count = Subquery(
+        reviews.annotate(total=Count('id')).values('total')
+    )
+    Title.objects.update(
+        rating_sum=Coalesce(score_sum, 0),
+        rating_count=Coalesce(score_count, 0),
+        rating=ExpressionWrapper(
+            Cast(score_sum, FloatField()) / score_count,
+            output_field=FloatField()
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(blank=True, null=True, verbose_name='Рейтинг произведения'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, verbose_name='Сумма оценок'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='confirmation_code',
+            field=models.CharField(max_length=16, null=True, verbose_name='Код подтверждения'),
+        ),
+        migrations.RunPython(fill_rating, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+from django.db import migrations, models
+
+# Поиск SearchFilter (icontains) на PostgreSQL выполняется как
+# UPPER("поле"::text) LIKE UPPER(%s): индексы по этому выражению
+# с триграммами позволяют не сканировать таблицу целиком.
+TRIGRAM_INDEXES = (
+    ('reviews_genre_name_trgm_idx', 'reviews_genre', 'name'),
+    ('reviews_category_name_trgm_idx', 'reviews_category', 'name'),
+    ('reviews_title_name_trgm_idx', 'reviews_title', 'name'),
+    ('reviews_user_username_trgm_idx', 'reviews_user', 'username'),
+)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} '
+            f'USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_outbox_email'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['name'], name='title_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['year', 'name'], name='title_year_name_idx'),
+        ),
+        # Фильтр по жанру идёт от genre_id к title_id, а автоматический
+        # уникальный индекс связи начинается с title_id.
+        migrations.RunSQL(
+            'CREATE INDEX reviews_title_genre_genre_title_idx '
+            'ON reviews_title_genre (genre_id, title_id)',
+            'DROP INDEX reviews_title_genre_genre_title_idx',
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
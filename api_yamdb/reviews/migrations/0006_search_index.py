@@ -0,0 +1,85 @@
+from django.db import migrations
+
+# На SQLite индекс хранится во внешних таблицах FTS5 (content=...),
+# которые обновляются триггерами при любой записи, включая bulk_create
+# и импорт. Триггер на обновление срабатывает только при изменении
+# индексируемых колонок, а не при каждом пересчёте рейтинга.
+SQLITE_INDEXES = (
+    ('reviews_title', ('name', 'description')),
+    ('reviews_review', ('text',)),
+    ('reviews_comment', ('text',)),
+)
+
+# Выражения должны совпадать с reviews.search.POSTGRES_DOCUMENTS,
+# иначе планировщик не сможет использовать индексы.
+POSTGRES_INDEXES = (
+    (
+        'reviews_title_search_idx', 'reviews_title',
+        "coalesce(name, '') || ' ' || coalesce(description, '')",
+    ),
+    ('reviews_review_search_idx', 'reviews_review', 'text'),
+    ('reviews_comment_search_idx', 'reviews_comment', 'text'),
+)
+
+
+def sqlite_statements(table, columns):
+    fts = f'{table}_fts'
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    delete = (
+        f"INSERT INTO {fts}({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old});"
+    )
+    insert = f'INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new});'
+    return (
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, "
+        f"content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')",
+        f'CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} '
+        f'BEGIN {insert} END',
+        f'CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} '
+        f'BEGIN {delete} END',
+        f'CREATE TRIGGER {fts}_update AFTER UPDATE OF {names} ON {table} '
+        f'BEGIN {delete} {insert} END',
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    )
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for table, columns in SQLITE_INDEXES:
+            for sql in sqlite_statements(table, columns):
+                schema_editor.execute(sql)
+    elif vendor == 'postgresql':
+        for name, table, document in POSTGRES_INDEXES:
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {name} ON {table} '
+                f"USING gin (to_tsvector('russian', {document}))"
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for table, _ in SQLITE_INDEXES:
+            for action in ('insert', 'delete', 'update'):
+                schema_editor.execute(
+                    f'DROP TRIGGER IF EXISTS {table}_fts_{action}'
+                )
+            schema_editor.execute(f'DROP TABLE IF EXISTS {table}_fts')
+    elif vendor == 'postgresql':
+        for name, _, _ in POSTGRES_INDEXES:
+            schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 3.2 on 2026-10-18 05:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryStatistics',
+            fields=[
+                ('title_count', models.PositiveIntegerField(default=0, verbose_name='Количество произведений')),
+                ('review_count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('mean_rating', models.FloatField(blank=True, null=True, verbose_name='Средний рейтинг произведений')),
+                ('top_titles', models.JSONField(default=list, verbose_name='Произведения с лучшим рейтингом')),
+                ('refreshed_at', models.DateTimeField(auto_now=True, verbose_name='Время пересчёта')),
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='statistics', serialize=False, to='reviews.category', verbose_name='Категория')),
+            ],
+            options={
+                'verbose_name': 'показатели категории',
+                'verbose_name_plural': 'Показатели категорий',
+                'ordering': ('category',),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='GenreStatistics',
+            fields=[
+                ('title_count', models.PositiveIntegerField(default=0, verbose_name='Количество произведений')),
+                ('review_count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('mean_rating', models.FloatField(blank=True, null=True, verbose_name='Средний рейтинг произведений')),
+                ('top_titles', models.JSONField(default=list, verbose_name='Произведения с лучшим рейтингом')),
+                ('refreshed_at', models.DateTimeField(auto_now=True, verbose_name='Время пересчёта')),
+                ('genre', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='statistics', serialize=False, to='reviews.genre', verbose_name='Жанр')),
+            ],
+            options={
+                'verbose_name': 'показатели жанра',
+                'verbose_name_plural': 'Показатели жанров',
+                'ordering': ('genre',),
+                'abstract': False,
+            },
+        ),
+    ]
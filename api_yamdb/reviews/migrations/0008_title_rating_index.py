@@ -0,0 +1,39 @@
+from django.db import migrations
+
+# Индекс под ORDER BY rating DESC NULLS LAST, id DESC. В SQLite NULL
+# меньше любого значения и сам оказывается в конце при DESC, а
+# NULLS LAST в определении индекса не поддерживается.
+INDEX_SQL = {
+    'postgresql': (
+        'CREATE INDEX title_rating_idx ON reviews_title '
+        '(rating DESC NULLS LAST, id DESC)'
+    ),
+    'sqlite': (
+        'CREATE INDEX title_rating_idx ON reviews_title (rating DESC, id DESC)'
+    ),
+}
+
+
+def create_rating_index(apps, schema_editor):
+    schema_editor.execute(INDEX_SQL.get(
+        schema_editor.connection.vendor,
+        'CREATE INDEX title_rating_idx ON reviews_title (rating, id)'
+    ))
+
+
+def drop_rating_index(apps, schema_editor):
+    schema_editor.execute(schema_editor.sql_delete_index % {
+        'table': schema_editor.quote_name('reviews_title'),
+        'name': schema_editor.quote_name('title_rating_idx'),
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_statistics'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_rating_index, drop_rating_index),
+    ]
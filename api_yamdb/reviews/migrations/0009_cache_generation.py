@@ -0,0 +1,24 @@
+# Generated by Django 3.2 on 2026-10-18 06:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_title_rating_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheGeneration',
+            fields=[
+                ('namespace', models.CharField(max_length=256, primary_key=True, serialize=False, verbose_name='Пространство имён')),
+                ('generation', models.BigIntegerField(verbose_name='Поколение')),
+            ],
+            options={
+                'verbose_name': 'поколение кеша',
+                'verbose_name_plural': 'Поколения кеша',
+            },
+        ),
+    ]
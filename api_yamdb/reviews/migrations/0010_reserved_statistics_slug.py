@@ -0,0 +1,24 @@
+# Generated by Django 3.2 on 2026-10-18 06:37
+
+from django.db import migrations, models
+import reviews.validators
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_cache_generation'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='category',
+            name='slug',
+            field=models.SlugField(help_text='Идентификатор страницы для URL; разрешены символы латиницы, цифры, дефис и подчёркивание.', unique=True, validators=[reviews.validators.validate_slug], verbose_name='Идентификатор'),
+        ),
+        migrations.AlterField(
+            model_name='genre',
+            name='slug',
+            field=models.SlugField(help_text='Идентификатор страницы для URL; разрешены символы латиницы, цифры, дефис и подчёркивание.', unique=True, validators=[reviews.validators.validate_slug], verbose_name='Идентификатор'),
+        ),
+    ]
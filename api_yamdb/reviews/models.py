@@ -2,6 +2,12 @@ from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import (
+    Case, Count, ExpressionWrapper, F, FloatField, OuterRef, Subquery, Sum,
+    When
+)
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
 
 from .constants import (
     MAX_LENGTH_EMAIL, MAX_LENGTH_FIRST_NAME, MAX_LENGTH_STR,
@@ -9,7 +15,7 @@ from .constants import (
     MAX_LENGTH_USERNAME, MAX_VALUE_SCORE, MIN_VALUE_SCORE, USER, MODERATOR,
     ADMIN, ROLE_CHOICES
 )
-from .validators import validate_year, validate_username
+from .validators import validate_slug, validate_year, validate_username
 
 
 class User(AbstractUser):
@@ -79,6 +85,7 @@ class NameSlugBaseModel(models.Model):
     slug = models.SlugField(
         max_length=MAX_LENGTH_SLUG,
         unique=True,
+        validators=(validate_slug,),
         verbose_name='Идентификатор',
         help_text='Идентификатор страницы для URL; разрешены символы латиницы,'
                   ' цифры, дефис и подчёркивание.'
@@ -132,6 +139,45 @@ class Category(NameSlugBaseModel):
         verbose_name_plural = 'Категории'
 
 
+class TitleQuerySet(models.QuerySet):
+
+    def shift_rating(self, score_delta, count_delta=0):
+        """Сдвигает сохранённый рейтинг одним UPDATE без чтения строк."""
+        new_sum = F('rating_sum') + score_delta
+        new_count = F('rating_count') + count_delta
+        return self.update(
+            rating_sum=new_sum,
+            rating_count=new_count,
+            rating=Case(
+                When(rating_count=-count_delta, then=None),
+                default=ExpressionWrapper(
+                    Cast(new_sum, FloatField()) / new_count,
+                    output_field=FloatField()
+                ),
+            )
+        )
+
+    def refresh_rating(self):
+        """Пересчитывает сохранённый рейтинг по отзывам."""
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        score_sum = Subquery(
+            reviews.annotate(total=Sum('score')).values('total')
+        )
+        score_count = Subquery(
+            reviews.annotate(total=Count('id')).values('total')
+        )
+        return self.update(
+            rating_sum=Coalesce(score_sum, 0),
+            rating_count=Coalesce(score_count, 0),
+            rating=ExpressionWrapper(
+                Cast(score_sum, FloatField()) / score_count,
+                output_field=FloatField()
+            )
+        )
+
+
 class Title(models.Model):
     """Модель произведения."""
 
@@ -155,8 +201,27 @@ class Title(models.Model):
         null=True,
         verbose_name='Категория произведения'
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Сумма оценок'
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество оценок'
+    )
+    rating = models.FloatField(
+        blank=True,
+        null=True,
+        verbose_name='Рейтинг произведения'
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
+        indexes = (
+            models.Index(fields=('name',), name='title_name_idx'),
+            models.Index(fields=('year', 'name'), name='title_year_name_idx'),
+        )
         ordering = ('name',)
         verbose_name = 'произведение'
         verbose_name_plural = 'Произведения'
@@ -185,6 +250,12 @@ class Review(TextBaseModel):
                 name='unique_title_author'
             ),
         )
+        indexes = (
+            models.Index(
+                fields=('title', '-pub_date', 'id'),
+                name='review_title_feed_idx'
+            ),
+        )
         verbose_name = 'отзыв'
         verbose_name_plural = 'Отзывы'
 
@@ -202,8 +273,159 @@ class Comment(TextBaseModel):
     )
 
     class Meta(TextBaseModel.Meta):
+        indexes = (
+            models.Index(
+                fields=('review', '-pub_date', 'id'),
+                name='comment_review_feed_idx'
+            ),
+        )
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
 
     def __str__(self):
         return f'Комментарий {self.author} к {self.review}'
+
+
+class OutboxEmail(models.Model):
+    """Модель письма в очереди на отправку."""
+
+    subject = models.CharField(max_length=MAX_LENGTH_NAME, verbose_name='Тема')
+    body = models.TextField(verbose_name='Текст')
+    from_email = models.EmailField(
+        max_length=MAX_LENGTH_EMAIL,
+        verbose_name='Отправитель'
+    )
+    recipient = models.EmailField(
+        max_length=MAX_LENGTH_EMAIL,
+        verbose_name='Получатель'
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Время постановки в очередь'
+    )
+    sent_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='Время отправки'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток отправки'
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Время следующей попытки'
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка'
+    )
+
+    class Meta:
+        ordering = ('next_attempt_at',)
+        indexes = (
+            models.Index(
+                fields=('sent_at', 'next_attempt_at'),
+                name='outbox_pending_idx'
+            ),
+        )
+        verbose_name = 'письмо'
+        verbose_name_plural = 'Исходящие письма'
+
+    def __str__(self):
+        return f'Письмо {self.recipient}: {self.subject[:MAX_LENGTH_STR]}'
+
+
+class StatisticsBaseModel(models.Model):
+    """Сохранённые показатели группы произведений.
+
+    Пересчитываются командой `refresh_statistics`, поэтому страница
+    жанра или категории читает одну строку вместо агрегации.
+    """
+
+    title_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество произведений'
+    )
+    review_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество отзывов'
+    )
+    mean_rating = models.FloatField(
+        blank=True,
+        null=True,
+        verbose_name='Средний рейтинг произведений'
+    )
+    top_titles = models.JSONField(
+        default=list,
+        verbose_name='Произведения с лучшим рейтингом'
+    )
+    refreshed_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Время пересчёта'
+    )
+
+    class Meta:
+        abstract = True
+
+
+class GenreStatistics(StatisticsBaseModel):
+    """Модель показателей жанра."""
+
+    genre = models.OneToOneField(
+        Genre,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='statistics',
+        verbose_name='Жанр'
+    )
+
+    class Meta(StatisticsBaseModel.Meta):
+        ordering = ('genre',)
+        verbose_name = 'показатели жанра'
+        verbose_name_plural = 'Показатели жанров'
+
+    def __str__(self):
+        return f'Показатели жанра {self.genre_id}'
+
+
+class CategoryStatistics(StatisticsBaseModel):
+    """Модель показателей категории."""
+
+    category = models.OneToOneField(
+        Category,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='statistics',
+        verbose_name='Категория'
+    )
+
+    class Meta(StatisticsBaseModel.Meta):
+        ordering = ('category',)
+        verbose_name = 'показатели категории'
+        verbose_name_plural = 'Показатели категорий'
+
+    def __str__(self):
+        return f'Показатели категории {self.category_id}'
+
+
+class CacheGeneration(models.Model):
+    """Модель номера поколения пространства имён кеша API.
+
+    Номер хранится в БД, а не в кеше процесса, чтобы все процессы
+    строили ключи кеша и ETag от одного и того же состояния.
+    """
+
+    namespace = models.CharField(
+        max_length=MAX_LENGTH_NAME,
+        primary_key=True,
+        verbose_name='Пространство имён'
+    )
+    generation = models.BigIntegerField(verbose_name='Поколение')
+
+    class Meta:
+        verbose_name = 'поколение кеша'
+        verbose_name_plural = 'Поколения кеша'
+
+    def __str__(self):
+        return f'{self.namespace}: {self.generation}'
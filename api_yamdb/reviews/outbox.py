@@ -0,0 +1,116 @@
+"""Очередь исходящих писем.
+
+Представления только ставят письмо в очередь, а отправляет его
+команда `send_emails` пачками через одно соединение с почтовым
+сервером. При ошибке отправка повторяется с растущей задержкой.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_email(subject, body, recipient):
+    email = OutboxEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=settings.SENDER_EMAIL,
+        recipient=recipient
+    )
+    if settings.EMAIL_OUTBOX_EAGER:
+        transaction.on_commit(send_pending_emails)
+    return email
+
+
+def get_pending_emails():
+    return OutboxEmail.objects.filter(
+        sent_at__isnull=True,
+        attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        next_attempt_at__lte=timezone.now()
+    )
+
+
+def mark_failed(email, error):
+    logger.warning('Письмо %s не отправлено: %s', email.id, error)
+    email.attempts += 1
+    email.last_error = str(error)
+    email.next_attempt_at = timezone.now() + timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1)
+    )
+
+
+def claim_emails(batch_size):
+    """Берёт пачку писем в отправку, откладывая их следующую попытку."""
+    with transaction.atomic():
+        emails = list(
+            get_pending_emails().select_for_update(
+                skip_locked=True
+            )[:batch_size]
+        )
+        OutboxEmail.objects.filter(
+            id__in=[email.id for email in emails]
+        ).update(
+            next_attempt_at=timezone.now() + timedelta(
+                seconds=settings.EMAIL_OUTBOX_LEASE
+            )
+        )
+    return emails
+
+
+def deliver(emails):
+    """Отправляет письма через одно соединение, вне транзакции."""
+    sent, failed = [], []
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        for email in emails:
+            mark_failed(email, error)
+        return sent, emails
+    try:
+        for email in emails:
+            try:
+                connection.send_messages([EmailMessage(
+                    email.subject,
+                    email.body,
+                    email.from_email,
+                    [email.recipient]
+                )])
+            except Exception as error:
+                mark_failed(email, error)
+                failed.append(email)
+            else:
+                sent.append(email.id)
+    finally:
+        connection.close()
+    return sent, failed
+
+
+def send_pending_emails(batch_size=None):
+    """Отправляет пачку писем через одно соединение.
+
+    Письма берутся и результаты сохраняются короткими транзакциями,
+    а почтовый сервер ждёт без открытой транзакции, чтобы не держать
+    блокировки БД на время отправки. Возвращает число отправленных
+    и неотправленных писем.
+    """
+    emails = claim_emails(batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE)
+    if not emails:
+        return 0, 0
+    sent, failed = deliver(emails)
+    with transaction.atomic():
+        OutboxEmail.objects.filter(id__in=sent).update(
+            sent_at=timezone.now(), attempts=F('attempts') + 1
+        )
+        OutboxEmail.objects.bulk_update(
+            failed, ('attempts', 'last_error', 'next_attempt_at')
+        )
+    return len(sent), len(failed)
@@ -0,0 +1,156 @@
+"""Полнотекстовый поиск по произведениям, отзывам и комментариям.
+
+На SQLite используются таблицы FTS5, которые триггеры синхронизируют
+с исходными таблицами. На PostgreSQL - GIN-индексы по выражениям
+to_tsvector, которые не требуют синхронизации вовсе. Выражения
+документов должны совпадать с индексами из миграции 0006_search_index.
+"""
+from django.db import connection
+from django.db.models import Q
+
+from .models import Comment, Review, Title
+
+KINDS = ('title', 'review', 'comment')
+POSTGRES_CONFIG = 'russian'
+POSTGRES_DOCUMENTS = {
+    'title': (
+        "coalesce(t.name, '') || ' ' || coalesce(t.description, '')"
+    ),
+    'review': 'r.text',
+    'comment': 'c.text',
+}
+
+SQLITE_QUERIES = {
+    'title': '''
+        SELECT 'title', t.id, t.id, NULL,
+               snippet(reviews_title_fts, -1, '[', ']', '…', 12),
+               -bm25(reviews_title_fts)
+        FROM reviews_title_fts
+        JOIN reviews_title t ON t.id = reviews_title_fts.rowid
+        WHERE reviews_title_fts MATCH %s
+    ''',
+    'review': '''
+        SELECT 'review', r.id, r.title_id, r.id,
+               snippet(reviews_review_fts, -1, '[', ']', '…', 12),
+               -bm25(reviews_review_fts)
+        FROM reviews_review_fts
+        JOIN reviews_review r ON r.id = reviews_review_fts.rowid
+        WHERE reviews_review_fts MATCH %s
+    ''',
+    'comment': '''
+        SELECT 'comment', c.id, r.title_id, c.review_id,
+               snippet(reviews_comment_fts, -1, '[', ']', '…', 12),
+               -bm25(reviews_comment_fts)
+        FROM reviews_comment_fts
+        JOIN reviews_comment c ON c.id = reviews_comment_fts.rowid
+        JOIN reviews_review r ON r.id = c.review_id
+        WHERE reviews_comment_fts MATCH %s
+    ''',
+}
+POSTGRES_QUERIES = {
+    'title': '''
+        SELECT 'title' AS kind, t.id, t.id AS title_id,
+               NULL::integer AS review_id,
+               {document} AS body,
+               ts_rank(to_tsvector('{config}', {document}), query) AS rank
+        FROM reviews_title t, plainto_tsquery('{config}', %s) query
+        WHERE to_tsvector('{config}', {document}) @@ query
+    ''',
+    'review': '''
+        SELECT 'review', r.id, r.title_id, r.id, {document},
+               ts_rank(to_tsvector('{config}', {document}), query)
+        FROM reviews_review r, plainto_tsquery('{config}', %s) query
+        WHERE to_tsvector('{config}', {document}) @@ query
+    ''',
+    'comment': '''
+        SELECT 'comment', c.id, r.title_id, c.review_id, {document},
+               ts_rank(to_tsvector('{config}', {document}), query)
+        FROM reviews_comment c
+        JOIN reviews_review r ON r.id = c.review_id,
+        plainto_tsquery('{config}', %s) query
+        WHERE to_tsvector('{config}', {document}) @@ query
+    ''',
+}
+FIELDS = ('type', 'id', 'title_id', 'review_id', 'snippet', 'rank')
+
+
+def fts5_query(text):
+    """Экранирует слова запроса: каждое ищется как отдельная фраза."""
+    return ' '.join(
+        '"{}"'.format(word.replace('"', '""')) for word in text.split()
+    )
+
+
+def search_sqlite(text, kinds, limit, offset):
+    sql = ' UNION ALL '.join(SQLITE_QUERIES[kind] for kind in kinds)
+    query = fts5_query(text)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'{sql} ORDER BY 6 DESC, 2 LIMIT %s OFFSET %s',
+            [query] * len(kinds) + [limit, offset]
+        )
+        return cursor.fetchall()
+
+
+def search_postgresql(text, kinds, limit, offset):
+    sql = ' UNION ALL '.join(
+        POSTGRES_QUERIES[kind].format(
+            document=POSTGRES_DOCUMENTS[kind], config=POSTGRES_CONFIG
+        )
+        for kind in kinds
+    )
+    # Фрагменты с подсветкой строятся только для найденной страницы.
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'''
+            SELECT page.kind, page.id, page.title_id, page.review_id,
+                   ts_headline('{POSTGRES_CONFIG}', page.body,
+                               plainto_tsquery('{POSTGRES_CONFIG}', %s),
+                               'StartSel=[, StopSel=], MaxWords=12'),
+                   page.rank
+            FROM ({sql} ORDER BY 6 DESC, 2 LIMIT %s OFFSET %s) page
+            ORDER BY page.rank DESC, page.id
+            ''',
+            [text] + [text] * len(kinds) + [limit, offset]
+        )
+        return cursor.fetchall()
+
+
+def search_fallback(text, kinds, limit, offset):
+    """Поиск без индекса для прочих СУБД."""
+    rows = []
+    if 'title' in kinds:
+        rows += [
+            ('title', title.id, title.id, None, title.name, 0)
+            for title in Title.objects.filter(
+                Q(name__icontains=text) | Q(description__icontains=text)
+            )
+        ]
+    if 'review' in kinds:
+        rows += [
+            ('review', review.id, review.title_id, review.id, review.text, 0)
+            for review in Review.objects.filter(text__icontains=text)
+        ]
+    if 'comment' in kinds:
+        rows += [
+            ('comment', comment.id, comment.review.title_id,
+             comment.review_id, comment.text, 0)
+            for comment in Comment.objects.filter(
+                text__icontains=text
+            ).select_related('review')
+        ]
+    return rows[offset:offset + limit]
+
+
+def search(text, kinds=KINDS, limit=10, offset=0):
+    """Возвращает найденные объекты по убыванию релевантности."""
+    if not text.strip():
+        return []
+    backend = {
+        'sqlite': search_sqlite,
+        'postgresql': search_postgresql,
+    }.get(connection.vendor, search_fallback)
+    return [
+        dict(zip(FIELDS, row))
+        for row in backend(text, kinds, limit, offset)
+    ]
@@ -0,0 +1,68 @@
+"""Пересчёт сохранённых показателей жанров и категорий.
+
+Количество произведений и отзывов и средний рейтинг считаются одним
+запросом для всех групп сразу, лучшие произведения - запросом на группу.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, Sum
+
+from .models import Category, CategoryStatistics, Genre, GenreStatistics
+
+TOP_TITLE_FIELDS = ('id', 'name', 'year', 'rating')
+GROUPS = {
+    Genre: GenreStatistics,
+    Category: CategoryStatistics,
+}
+
+
+def get_top_titles(group):
+    return list(
+        group.title_set.filter(rating__isnull=False).order_by(
+            '-rating', 'id'
+        ).values(*TOP_TITLE_FIELDS)[:settings.STATISTICS_TOP_TITLES]
+    )
+
+
+def refresh_statistics(model, ids=None):
+    """Пересчитывает показатели групп модели `model` (всех или `ids`)."""
+    statistics_model = GROUPS[model]
+    groups = model.objects.all()
+    if ids is not None:
+        groups = groups.filter(id__in=ids)
+    groups = groups.annotate(
+        title_count=Count('title'),
+        review_count=Sum('title__rating_count'),
+        mean_rating=Avg('title__rating')
+    )
+    field = model._meta.model_name
+    statistics = [
+        statistics_model(**{
+            field: group,
+            'title_count': group.title_count,
+            'review_count': group.review_count or 0,
+            'mean_rating': group.mean_rating,
+            'top_titles': get_top_titles(group),
+        })
+        for group in groups
+    ]
+    with transaction.atomic():
+        stale = statistics_model.objects.all()
+        if ids is not None:
+            stale = stale.filter(pk__in=ids)
+        stale.delete()
+        # Показатели группы мог одновременно сохранить другой запрос.
+        statistics_model.objects.bulk_create(
+            statistics, ignore_conflicts=True
+        )
+    return len(statistics)
+
+
+def get_statistics(group):
+    """Показатели группы; пересчитываются, если ещё не сохранены."""
+    statistics_model = GROUPS[type(group)]
+    statistics = statistics_model.objects.filter(pk=group.pk).first()
+    if statistics is None:
+        refresh_statistics(type(group), [group.pk])
+        statistics = statistics_model.objects.get(pk=group.pk)
+    return statistics
@@ -13,6 +13,15 @@ def validate_year(year):
     return year
 
 
+def validate_slug(slug):
+    """Слаг не должен совпадать с адресом списка показателей."""
+    if slug == settings.STATISTICS_URL:
+        raise ValidationError(
+            f'Использовать {slug} в качестве идентификатора запрещено!'
+        )
+    return slug
+
+
 def validate_username(username):
     """Проверка имени пользователя на соответствие шаблону."""
     if username == settings.USER_PROFILE_URL:
@@ -0,0 +1,221 @@
+"""Нагрузка на GET-эндпоинты через WSGI, ASGI и ASGI с ASYNC_READ_VIEWS.
+
+Приложения вызываются в процессе, без HTTP-сервера: WSGI - из пула
+потоков по числу одновременных соединений, ASGI - из задач asyncio.
+Каждый режим запускается в отдельном процессе с общей временной БД
+SQLite. Кеш ответов отключён, чтобы измерялась работа представлений.
+Память на соединение - прирост пикового RSS процесса за время нагрузки,
+делённый на число соединений. `--latency` добавляет задержку к каждому
+запросу к БД, как у PostgreSQL по сети.
+
+    python benchmarks/asgi_load.py --seconds 5 --concurrency 32
+"""
+import argparse
+import asyncio
+import io
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+os.environ['DB_ENGINE'] = 'sqlite'
+
+MODES = {
+    'wsgi': {'ASYNC_READ_VIEWS': '0'},
+    'asgi': {'ASYNC_READ_VIEWS': '0'},
+    'asgi-async': {'ASYNC_READ_VIEWS': '1'},
+}
+
+
+def setup():
+    import django
+    from django.conf import settings
+
+    settings.DEBUG = False
+    settings.CACHES['benchmark'] = {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache'
+    }
+    settings.API_CACHE_ALIAS = 'benchmark'
+    django.setup()
+
+
+def seed():
+    setup()
+    from django.core.management import call_command
+    from reviews.models import Category, Comment, Review, Title, User
+
+    call_command('migrate', verbosity=0)
+    category = Category.objects.create(name='Фильм', slug='films')
+    Title.objects.bulk_create(
+        Title(name=f'Фильм {number}', year=2000, category=category)
+        for number in range(100)
+    )
+    title = Title.objects.order_by('id').first()
+    User.objects.bulk_create(
+        User(username=f'reader{number}', email=f'reader{number}@yamdb.fake')
+        for number in range(20)
+    )
+    for author in User.objects.filter(username__startswith='reader'):
+        review = Review.objects.create(
+            title=title, author=author, text='Отзыв', score=7
+        )
+        Comment.objects.bulk_create(
+            Comment(review=review, author=author, text='Комментарий')
+            for _ in range(5)
+        )
+    Title.objects.refresh_rating()
+
+
+def add_latency(milliseconds):
+    from django.db.backends import utils
+
+    execute = utils.CursorWrapper._execute
+
+    def delayed(self, *args):
+        time.sleep(milliseconds / 1000)
+        return execute(self, *args)
+
+    utils.CursorWrapper._execute = delayed
+
+
+def get_urls():
+    from reviews.models import Review
+
+    review = Review.objects.order_by('id').first()
+    return [
+        '/api/v1/titles/',
+        f'/api/v1/titles/{review.title_id}/',
+        f'/api/v1/titles/{review.title_id}/reviews/',
+        f'/api/v1/titles/{review.title_id}/reviews/{review.id}/comments/',
+    ]
+
+
+def run_wsgi(urls, seconds, concurrency):
+    from django.core.wsgi import get_wsgi_application
+
+    application = get_wsgi_application()
+
+    def request(url):
+        environ = {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': url, 'QUERY_STRING': '',
+            'SERVER_NAME': 'testserver', 'SERVER_PORT': '80',
+            'HTTP_HOST': 'testserver', 'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr,
+        }
+        body = b''.join(application(environ, lambda *args: None))
+        return len(body)
+
+    def worker(number):
+        deadline = time.monotonic() + seconds
+        done = 0
+        while time.monotonic() < deadline:
+            request(urls[(number + done) % len(urls)])
+            done += 1
+        return done
+
+    for url in urls:
+        request(url)
+    with ThreadPoolExecutor(concurrency) as executor:
+        return sum(executor.map(worker, range(concurrency)))
+
+
+def run_asgi(urls, seconds, concurrency):
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+
+    async def request(url):
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'},
+            'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+            'path': url, 'raw_path': url.encode(), 'query_string': b'',
+            'headers': [(b'host', b'testserver')],
+            'server': ('testserver', 80), 'client': ('127.0.0.1', 0),
+        }
+        messages = [{'type': 'http.request', 'body': b''}]
+        body = []
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await asyncio.Event().wait()
+
+        async def send(message):
+            if message['type'] == 'http.response.body':
+                body.append(message.get('body', b''))
+
+        await application(scope, receive, send)
+        return len(b''.join(body))
+
+    async def worker(number, deadline):
+        done = 0
+        while time.monotonic() < deadline:
+            await request(urls[(number + done) % len(urls)])
+            done += 1
+        return done
+
+    async def main():
+        for url in urls:
+            await request(url)
+        deadline = time.monotonic() + seconds
+        return sum(await asyncio.gather(*(
+            worker(number, deadline) for number in range(concurrency)
+        )))
+
+    return asyncio.run(main())
+
+
+def run(mode, seconds, concurrency, latency):
+    setup()
+    urls = get_urls()
+    if latency:
+        add_latency(latency)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if mode == 'wsgi':
+        done = run_wsgi(urls, seconds, concurrency)
+    else:
+        done = run_asgi(urls, seconds, concurrency)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f'{mode:<12}{done / seconds:>12.0f}'
+          f'{(peak - baseline) / concurrency:>16.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--latency', type=float, default=0,
+                        help='задержка запроса к БД, мс')
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--seed', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.seed:
+        return seed()
+    if args.mode:
+        return run(args.mode, args.seconds, args.concurrency, args.latency)
+    with tempfile.TemporaryDirectory() as directory:
+        environment = {
+            **os.environ, 'SQLITE_PATH': str(Path(directory) / 'db.sqlite3')
+        }
+        subprocess.run(
+            [sys.executable, __file__, '--seed'], check=True, env=environment
+        )
+        print(f'{"режим":<12}{"запросов/с":>12}{"КиБ/соединение":>16}')
+        for mode, variables in MODES.items():
+            subprocess.run(
+                [sys.executable, __file__, '--mode', mode,
+                 '--seconds', str(args.seconds),
+                 '--concurrency', str(args.concurrency),
+                 '--latency', str(args.latency)],
+                check=True, env={**environment, **variables}
+            )
+
+
+if __name__ == '__main__':
+    main()
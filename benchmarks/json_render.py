@@ -0,0 +1,84 @@
+"""Скорость рендеринга и разбора JSON: JSONRenderer DRF против orjson.
+
+Данные - вывод TitleReadSerializer для страницы произведений с жанрами
+и категорией из временной БД SQLite.
+
+    python benchmarks/json_render.py --titles 100 --number 500
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+os.environ['DB_ENGINE'] = 'sqlite'
+
+
+def get_page(size):
+    from django.core.management import call_command
+    from reviews.models import Category, Genre, Title
+
+    from api.serializers import TitleReadSerializer
+
+    call_command('migrate', verbosity=0)
+    category = Category.objects.create(name='Фильм', slug='films')
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {number}', slug=f'genre-{number}')
+        for number in range(10)
+    )
+    genres = list(Genre.objects.all())
+    Title.objects.bulk_create(
+        Title(name=f'Фильм {number}', year=2000, category=category,
+              description='Описание произведения ' * 10,
+              rating=number % 10 + 0.5)
+        for number in range(size)
+    )
+    for number, title in enumerate(Title.objects.all()):
+        title.genre.set(genres[number % 10:number % 10 + 3])
+    titles = Title.objects.select_related('category').prefetch_related(
+        'genre'
+    )
+    return {
+        'count': size, 'next': None, 'previous': None,
+        'results': TitleReadSerializer(titles, many=True).data,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--titles', type=int, default=100)
+    parser.add_argument('--number', type=int, default=500)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['SQLITE_PATH'] = str(Path(directory) / 'db.sqlite3')
+        import django
+
+        django.setup()
+        from rest_framework.parsers import JSONParser
+        from rest_framework.renderers import JSONRenderer
+
+        from api.renderers import ORJSONParser, ORJSONRenderer
+
+        page = get_page(args.titles)
+        body = JSONRenderer().render(page)
+        print(f'страница: {len(body) / 1024:.1f} КиБ')
+        print(f'{"":<10}{"json, мс":>12}{"orjson, мс":>12}{"ускорение":>12}')
+        for name, stdlib, fast in (
+            ('рендер', lambda: JSONRenderer().render(page),
+             lambda: ORJSONRenderer().render(page)),
+            ('разбор', lambda: JSONParser().parse(io.BytesIO(body)),
+             lambda: ORJSONParser().parse(io.BytesIO(body))),
+        ):
+            slow_time = timeit.timeit(stdlib, number=args.number)
+            fast_time = timeit.timeit(fast, number=args.number)
+            print(f'{name:<10}{slow_time / args.number * 1000:>12.3f}'
+                  f'{fast_time / args.number * 1000:>12.3f}'
+                  f'{slow_time / fast_time:>11.1f}x')
+
+
+if __name__ == '__main__':
+    main()
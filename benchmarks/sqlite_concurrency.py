@@ -0,0 +1,132 @@
+"""Пропускная способность SQLite при одновременных чтении и записи.
+
+Сравнивает журнал по умолчанию (DELETE) с настройками SQLITE_PRAGMAS:
+потоки-читатели читают список произведений, потоки-писатели добавляют
+комментарии. Каждый режим работает со своей копией временной БД.
+В столбце "ошибок" - операции, завершившиеся "database is locked".
+
+    python benchmarks/sqlite_concurrency.py --seconds 5 --readers 4
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'api_yamdb'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+os.environ['DB_ENGINE'] = 'sqlite'
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import (  # noqa: E402
+    OperationalError, connections, transaction
+)
+from reviews.models import (  # noqa: E402
+    Category, Comment, Review, Title, User
+)
+
+MODES = {
+    'delete': {'journal_mode': 'delete'},
+    'pragmas': settings.SQLITE_PRAGMAS,
+}
+
+
+def use_database(path):
+    connections.close_all()
+    connections.databases['default']['NAME'] = str(path)
+
+
+def seed(path):
+    use_database(path)
+    call_command('migrate', verbosity=0)
+    category = Category.objects.create(name='Фильм', slug='films')
+    titles = Title.objects.bulk_create(
+        Title(name=f'Фильм {number}', year=2000, category=category)
+        for number in range(200)
+    )
+    author = User.objects.create(username='bench', email='bench@yamdb.fake')
+    title = Title.objects.order_by('id').first()
+    Review.objects.create(title=title, author=author, text='Отзыв', score=5)
+    return len(titles)
+
+
+def worker(operation, deadline, counters, errors):
+    done = 0
+    while time.monotonic() < deadline:
+        try:
+            operation()
+            done += 1
+        except OperationalError as error:
+            errors.append(error)
+    counters.append(done)
+    connections.close_all()
+
+
+def read():
+    list(Title.objects.select_related('category').order_by('-id')[:20])
+
+
+def write():
+    review = Review.objects.only('id', 'author_id').first()
+    with transaction.atomic():
+        Comment.objects.create(
+            review=review, author_id=review.author_id, text='Комментарий'
+        )
+
+
+def run(path, pragmas, seconds, readers, writers):
+    settings.SQLITE_PRAGMAS = pragmas
+    use_database(path)
+    # Режим журнала хранится в файле и меняется до запуска потоков.
+    connections['default'].ensure_connection()
+    deadline = time.monotonic() + seconds
+    reads, writes, errors = [], [], []
+    threads = [
+        threading.Thread(
+            target=worker, args=(read, deadline, reads, errors)
+        )
+        for _ in range(readers)
+    ] + [
+        threading.Thread(
+            target=worker, args=(write, deadline, writes, errors)
+        )
+        for _ in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(reads) / seconds, sum(writes) / seconds, len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        template = Path(directory) / 'template.sqlite3'
+        seed(template)
+        connections.close_all()
+        print(f'{"режим":<10}{"чтений/с":>12}{"записей/с":>12}'
+              f'{"ошибок":>10}')
+        for mode, pragmas in MODES.items():
+            path = Path(directory) / f'{mode}.sqlite3'
+            shutil.copy(template, path)
+            reads, writes, errors = run(
+                path, pragmas, args.seconds, args.readers, args.writers
+            )
+            print(f'{mode:<10}{reads:>12.0f}{writes:>12.0f}{errors:>10}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+BUDGET_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'query_budget.json'
+)
+# QUERY_BUDGET_UPDATE=1 перезаписывает файл бюджета замеренными значениями.
+UPDATE_BUDGET = bool(os.environ.get('QUERY_BUDGET_UPDATE'))
+RECORDS = {}
+
+
+class QueryTimer:
+    """Суммирует время SQL-запросов с точностью perf_counter.
+
+    CaptureQueriesContext округляет время запроса до миллисекунды,
+    и быстрые запросы в отчёте превращаются в ноль.
+    """
+
+    def __init__(self):
+        self.total = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.total += time.perf_counter() - started
+
+
+def load_budget():
+    if not os.path.exists(BUDGET_PATH):
+        return {}
+    with open(BUDGET_PATH, encoding='utf-8') as file:
+        return json.load(file)
+
+
+@contextmanager
+def measure_queries(endpoint):
+    """Замеряет SQL-запросы эндпоинта и сверяет их число с бюджетом.
+
+    Время в БД только выводится в отчёт: на in-memory SQLite оно
+    слишком зависит от машины, чтобы быть бюджетом.
+    """
+    timer = QueryTimer()
+    with CaptureQueriesContext(connection) as context:
+        with connection.execute_wrapper(timer):
+            yield context
+    queries = context.captured_queries
+    RECORDS[endpoint] = (len(queries), timer.total)
+    if UPDATE_BUDGET:
+        return
+    budget = load_budget()
+    assert endpoint in budget, (
+        f'Для эндпоинта `{endpoint}` не задан бюджет запросов в '
+        f'`{BUDGET_PATH}`. Запустите тесты с QUERY_BUDGET_UPDATE=1.'
+    )
+    sql = '\n'.join(query['sql'] for query in queries)
+    assert len(queries) <= budget[endpoint]['queries'], (
+        f'Эндпоинт `{endpoint}` выполнил {len(queries)} SQL-запросов при '
+        f'бюджете {budget[endpoint]["queries"]}:\n{sql}'
+    )
+
+
+@pytest.fixture
+def query_budget():
+    return measure_queries
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not UPDATE_BUDGET or not RECORDS:
+        return
+    budget = load_budget()
+    for endpoint, (queries, _) in RECORDS.items():
+        budget[endpoint] = {'queries': queries}
+    with open(BUDGET_PATH, 'w', encoding='utf-8') as file:
+        json.dump(budget, file, indent=4, sort_keys=True)
+        file.write('\n')
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not RECORDS:
+        return
+    budget = load_budget()
+    terminalreporter.section('Бюджет SQL-запросов')
+    for endpoint, (queries, db_time) in sorted(RECORDS.items()):
+        limit = budget.get(endpoint, {}).get('queries', '-')
+        terminalreporter.write_line(
+            f'{endpoint:<24} {queries:>3}/{limit:<3} {db_time * 1000:8.2f} мс'
+        )
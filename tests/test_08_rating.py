@@ -0,0 +1,129 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['rating']
+
+    def test_01_rating_follows_reviews(self, client, admin_client,
+                                       user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        assert self.get_rating(client, title_id) is None
+
+        create_single_review(admin_client, title_id, 'Отлично', 10)
+        review_id = create_single_review(
+            user_client, title_id, 'Неплохо', 5
+        ).json()['id']
+        create_single_review(moderator_client, title_id, 'Так себе', 4)
+        assert self.get_rating(client, title_id) == 6, (
+            'Проверьте, что рейтинг произведения обновляется при создании '
+            'отзыва.'
+        )
+
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id
+        )
+        user_client.patch(url, data={'score': 8})
+        assert self.get_rating(client, title_id) == 7, (
+            'Проверьте, что рейтинг произведения обновляется при изменении '
+            'оценки в отзыве.'
+        )
+
+        user_client.delete(url)
+        assert self.get_rating(client, title_id) == 7, (
+            'Проверьте, что рейтинг произведения обновляется при удалении '
+            'отзыва.'
+        )
+        assert self.get_rating(client, titles[1]['id']) is None
+
+    def test_02_duplicate_review_keeps_rating(self, client, admin_client,
+                                              user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Неплохо', 6)
+        response = user_client.post(
+            f'/api/v1/titles/{title_id}/reviews/',
+            data={'text': 'Передумал', 'score': 1}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {'non_field_errors': [
+            'Вы уже оставляли отзыв на это произведение.'
+        ]}, (
+            'Проверьте, что ответ на повторный отзыв содержит ошибку '
+            'в `non_field_errors`.'
+        )
+        assert self.get_rating(client, title_id) == 6, (
+            'Проверьте, что отклонённый повторный отзыв не меняет рейтинг '
+            'произведения.'
+        )
+
+    def test_03_other_integrity_errors_are_not_duplicates(
+        self, admin_client, user_client, monkeypatch
+    ):
+        from django.db import IntegrityError
+
+        from api.serializers import ReviewSerializer
+
+        titles, _, _ = create_titles(admin_client)
+
+        def save(self, **kwargs):
+            raise IntegrityError('FOREIGN KEY constraint failed')
+
+        monkeypatch.setattr(ReviewSerializer, 'save', save)
+        with pytest.raises(IntegrityError):
+            user_client.post(
+                f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+                data={'text': 'Отзыв', 'score': 5}
+            )
+
+    def test_04_rating_after_author_deleted(self, client, admin_client,
+                                            user_client, user):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'Отлично', 10)
+        create_single_review(user_client, title_id, 'Плохо', 1)
+
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert self.get_rating(client, title_id) == 10, (
+            'Проверьте, что при удалении пользователя рейтинг произведений '
+            'пересчитывается без его отзывов.'
+        )
+
+    def test_05_rebuild_ratings_command(self, admin_client, user_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Неплохо', 5)
+        call_command('rebuild_ratings', '--check')
+
+        Title.objects.filter(id=title_id).update(
+            rating_sum=0, rating_count=0, rating=None
+        )
+        with pytest.raises(CommandError):
+            call_command('rebuild_ratings', '--check')
+
+        call_command('rebuild_ratings')
+        call_command('rebuild_ratings', '--check')
+        title = Title.objects.get(id=title_id)
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            5, 1, 5.0
+        )
@@ -0,0 +1,46 @@
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def create_many_titles(self, admin_client, count):
+        titles, categories, genres = create_titles(admin_client)
+        for number in range(count - len(titles)):
+            admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {number}',
+                'year': 2000,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[number % 2]['slug'],
+            })
+        return titles
+
+    @pytest.mark.parametrize('count', (2, 10))
+    def test_01_title_list_queries(self, client, admin_client, count,
+                                   django_assert_num_queries):
+        self.create_many_titles(admin_client, count)
+        # Номер поколения, COUNT(*) страницы, произведения с категориями,
+        # жанры.
+        with django_assert_num_queries(4):
+            response = client.get(self.TITLES_URL)
+        assert len(response.json()['results']) == count, (
+            'Проверьте, что число запросов к БД при получении списка '
+            'произведений не зависит от размера страницы.'
+        )
+
+    def test_02_title_detail_queries(self, client, admin_client,
+                                     django_assert_num_queries):
+        titles = self.create_many_titles(admin_client, 2)
+        # Номер поколения, произведение с категорией, жанры.
+        with django_assert_num_queries(3):
+            response = client.get(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(
+                    title_id=titles[0]['id']
+                )
+            )
+        assert len(response.json()['genre']) == 2
@@ -0,0 +1,140 @@
+import pytest
+
+CATEGORIES_URL = '/api/v1/categories/'
+GENRES_URL = '/api/v1/genres/'
+TITLES_URL = '/api/v1/titles/'
+TITLE_DETAIL_URL = '/api/v1/titles/{title}/'
+REVIEWS_URL = '/api/v1/titles/{title}/reviews/'
+REVIEW_DETAIL_URL = '/api/v1/titles/{title}/reviews/{review}/'
+COMMENTS_URL = '/api/v1/titles/{title}/reviews/{review}/comments/'
+COMMENT_DETAIL_URL = (
+    '/api/v1/titles/{title}/reviews/{review}/comments/{comment}/'
+)
+USERS_URL = '/api/v1/users/'
+USER_DETAIL_URL = '/api/v1/users/{username}/'
+ME_URL = '/api/v1/users/me/'
+
+ENDPOINTS = (
+    ('categories-list', 'client', 'get', CATEGORIES_URL, None),
+    ('categories-create', 'admin_client', 'post', CATEGORIES_URL,
+     {'name': 'Музыка', 'slug': 'music'}),
+    ('categories-delete', 'admin_client', 'delete',
+     CATEGORIES_URL + '{category}/', None),
+    ('genres-list', 'client', 'get', GENRES_URL, None),
+    ('genres-statistics', 'client', 'get',
+     GENRES_URL + '{genre}/statistics/', None),
+    ('genres-statistics-list', 'client', 'get',
+     GENRES_URL + 'statistics/', None),
+    ('genres-create', 'admin_client', 'post', GENRES_URL,
+     {'name': 'Комедия', 'slug': 'comedy'}),
+    ('genres-delete', 'admin_client', 'delete', GENRES_URL + '{genre}/',
+     None),
+    ('titles-list', 'client', 'get', TITLES_URL, None),
+    ('titles-detail', 'client', 'get', TITLE_DETAIL_URL, None),
+    ('titles-create', 'admin_client', 'post', TITLES_URL,
+     {'name': 'Терминатор', 'year': 1984, 'genre': ['{genre}'],
+      'category': '{category}'}),
+    ('titles-bulk', 'admin_client', 'post', TITLES_URL + 'bulk/',
+     [{'name': 'Терминатор', 'year': 1984, 'genre': ['{genre}'],
+       'category': '{category}'},
+      {'id': '{title}', 'genre': ['{genre}']}]),
+    ('titles-update', 'admin_client', 'patch', TITLE_DETAIL_URL,
+     {'name': 'Терминатор 2'}),
+    ('titles-delete', 'admin_client', 'delete', TITLE_DETAIL_URL, None),
+    ('reviews-list', 'client', 'get', REVIEWS_URL, None),
+    ('reviews-detail', 'client', 'get', REVIEW_DETAIL_URL, None),
+    ('reviews-create', 'admin_client', 'post', REVIEWS_URL,
+     {'text': 'Отлично', 'score': 10}),
+    ('reviews-bulk', 'admin_client', 'post', REVIEWS_URL + 'bulk/',
+     [{'text': 'Отлично', 'score': 10}, {'text': 'Повтор', 'score': 1}]),
+    ('reviews-update', 'user_client', 'patch', REVIEW_DETAIL_URL,
+     {'score': 7}),
+    ('reviews-delete', 'user_client', 'delete', REVIEW_DETAIL_URL, None),
+    ('comments-list', 'client', 'get', COMMENTS_URL, None),
+    ('comments-detail', 'client', 'get', COMMENT_DETAIL_URL, None),
+    ('comments-create', 'admin_client', 'post', COMMENTS_URL,
+     {'text': 'Согласен'}),
+    ('comments-update', 'moderator_client', 'patch', COMMENT_DETAIL_URL,
+     {'text': 'Исправлено модератором'}),
+    ('comments-delete', 'user_client', 'delete', COMMENT_DETAIL_URL, None),
+    ('users-list', 'admin_client', 'get', USERS_URL, None),
+    ('users-detail', 'admin_client', 'get', USER_DETAIL_URL, None),
+    ('users-create', 'admin_client', 'post', USERS_URL,
+     {'username': 'new_user', 'email': 'new_user@yamdb.fake'}),
+    ('users-update', 'admin_client', 'patch', USER_DETAIL_URL,
+     {'bio': 'Новое описание'}),
+    ('users-delete', 'admin_client', 'delete', USER_DETAIL_URL, None),
+    ('users-me', 'user_client', 'get', ME_URL, None),
+    ('users-me-update', 'user_client', 'patch', ME_URL,
+     {'bio': 'Обновлённое описание'}),
+    ('auth-signup', 'client', 'post', '/api/v1/auth/signup/',
+     {'username': 'newcomer', 'email': 'newcomer@yamdb.fake'}),
+    ('auth-token', 'client', 'post', '/api/v1/auth/token/',
+     {'username': '{username}', 'confirmation_code': '12345678'}),
+    ('search', 'client', 'get', '/api/v1/search/?q=орешек', None),
+)
+
+
+@pytest.fixture(autouse=True)
+def queued_email_delivery(settings):
+    # Письма отправляет send_emails, а не обработчик запроса.
+    settings.EMAIL_OUTBOX_EAGER = False
+
+
+@pytest.fixture
+def dataset(user, admin, moderator):
+    from reviews.generations import bump_generations
+    from reviews.models import Category, Comment, Genre, Review, Title
+
+    category = Category.objects.create(name='Фильм', slug='films')
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    title = Title.objects.create(name='Крепкий орешек', year=1988,
+                                 category=category)
+    title.genre.set([genre])
+    review = Review.objects.create(title=title, author=user, text='Хорошо',
+                                   score=8)
+    Title.objects.filter(id=title.id).refresh_rating()
+    comment = Comment.objects.create(review=review, author=user,
+                                     text='Согласен')
+    user.confirmation_code = '12345678'
+    user.save()
+    # В рабочей БД поколения кеша уже созданы предыдущими записями.
+    bump_generations('categories', 'genres', 'titles', 'users',
+                     f'reviews:{title.id}', f'comments:{review.id}')
+    return {
+        'category': category.slug,
+        'genre': genre.slug,
+        'title': title.id,
+        'review': review.id,
+        'comment': comment.id,
+        'username': user.username,
+    }
+
+
+def fill(value, dataset):
+    if isinstance(value, str):
+        return value.format(**dataset)
+    if isinstance(value, list):
+        return [fill(item, dataset) for item in value]
+    if isinstance(value, dict):
+        return {key: fill(item, dataset) for key, item in value.items()}
+    return value
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize(
+    'endpoint,client_name,method,url,data', ENDPOINTS,
+    ids=[endpoint[0] for endpoint in ENDPOINTS]
+)
+def test_query_budget(endpoint, client_name, method, url, data, dataset,
+                      request, query_budget):
+    client = request.getfixturevalue(client_name)
+    kwargs = {'data': fill(data, dataset)} if data else {}
+    if isinstance(data, list):
+        kwargs['format'] = 'json'
+    with query_budget(endpoint):
+        response = getattr(client, method)(fill(url, dataset), **kwargs)
+    assert response.status_code < 400, (
+        f'Эндпоинт `{endpoint}` вернул ответ со статусом '
+        f'{response.status_code}: {response.content[:200]}'
+    )
@@ -0,0 +1,104 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11FeedCursorPagination:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.fixture
+    def feed(self, django_user_model):
+        from reviews.models import Comment, Review, Title
+
+        title = Title.objects.create(name='Матрица', year=1999)
+        django_user_model.objects.bulk_create(
+            django_user_model(
+                username=f'reader{number}',
+                email=f'reader{number}@yamdb.fake'
+            )
+            for number in range(25)
+        )
+        authors = list(django_user_model.objects.filter(
+            username__startswith='reader'
+        ))
+        reviews = [
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=5
+            )
+            for author in authors
+        ]
+        for number in range(25):
+            Comment.objects.create(
+                review=reviews[0], author=authors[0], text=f'Ответ {number}'
+            )
+        return title, reviews[0]
+
+    def collect_pages(self, client, url):
+        ids = []
+        url = f'{url}?cursor='
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что при курсорной пагинации в ответе нет '
+                'ключа `count`.'
+            )
+            assert not any(
+                'COUNT(' in query['sql'] for query in context.captured_queries
+            ), (
+                'Проверьте, что курсорная пагинация не выполняет COUNT(*).'
+            )
+            ids.extend(item['id'] for item in data['results'])
+            url = data['next']
+        return ids
+
+    def test_01_reviews_cursor_pages(self, client, feed):
+        from reviews.models import Review
+
+        title, _ = feed
+        ids = self.collect_pages(
+            client, self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        )
+        assert ids == list(
+            Review.objects.filter(title=title).order_by(
+                '-pub_date', 'id'
+            ).values_list('id', flat=True)
+        ), (
+            'Проверьте, что курсорная пагинация отзывов отдаёт все отзывы '
+            'без повторов в порядке (-pub_date, id).'
+        )
+
+    def test_02_comments_cursor_pages(self, client, feed):
+        from reviews.models import Comment
+
+        title, review = feed
+        ids = self.collect_pages(
+            client,
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title.id, review_id=review.id
+            )
+        )
+        assert ids == list(
+            Comment.objects.filter(review=review).order_by(
+                '-pub_date', 'id'
+            ).values_list('id', flat=True)
+        ), (
+            'Проверьте, что курсорная пагинация комментариев отдаёт все '
+            'комментарии без повторов в порядке (-pub_date, id).'
+        )
+
+    def test_03_page_number_by_default(self, client, feed):
+        title, _ = feed
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        )
+        assert response.json()['count'] == 25
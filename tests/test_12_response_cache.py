@@ -0,0 +1,67 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    GENRES_URL = '/api/v1/genres/'
+    CACHE_STATS_URL = '/api/v1/cache/stats/'
+
+    def test_01_repeated_read_is_cached(self, client, admin_client,
+                                        django_assert_num_queries):
+        create_titles(admin_client)
+        response = client.get(self.TITLES_URL)
+        assert response['X-Cache'] == 'MISS'
+        # Только номер поколения, без запроса данных.
+        with django_assert_num_queries(1):
+            cached = client.get(self.TITLES_URL)
+        assert cached['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный GET-запрос к '
+            f'`{self.TITLES_URL}` отдаётся из кеша.'
+        )
+        assert cached.json() == response.json()
+        assert client.get(f'{self.TITLES_URL}?year=1984')['X-Cache'] == (
+            'MISS'
+        )
+
+    def test_02_writes_invalidate_cache(self, client, admin_client,
+                                        user_client):
+        titles, _, genres = create_titles(admin_client)
+        client.get(self.TITLES_URL)
+        client.get(self.GENRES_URL)
+
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'name': 'Новое'}
+        )
+        response = client.get(self.TITLES_URL)
+        assert response['X-Cache'] == 'MISS'
+        assert 'Новое' in [title['name'] for title in response.json()[
+            'results'
+        ]]
+
+        create_single_review(user_client, titles[0]['id'], 'Хорошо', 8)
+        response = client.get(f'{self.TITLES_URL}{titles[0]["id"]}/')
+        assert response.json()['rating'] == 8, (
+            'Проверьте, что изменение рейтинга сбрасывает кеш произведений.'
+        )
+
+        admin_client.delete(f'{self.GENRES_URL}{genres[0]["slug"]}/')
+        assert client.get(self.GENRES_URL)['X-Cache'] == 'MISS'
+        assert client.get(self.TITLES_URL)['X-Cache'] == 'MISS', (
+            'Проверьте, что удаление жанра сбрасывает кеш произведений.'
+        )
+
+    def test_03_cache_stats(self, client, admin_client, user_client):
+        client.get(self.GENRES_URL)
+        client.get(self.GENRES_URL)
+        assert user_client.get(self.CACHE_STATS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        response = admin_client.get(self.CACHE_STATS_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {'hits': 1, 'misses': 1}
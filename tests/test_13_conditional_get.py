@@ -0,0 +1,143 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ConditionalGet:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.fixture
+    def urls(self, admin_client, admin, user_client, user):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        return {
+            'title': self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id),
+            'reviews': self.REVIEWS_URL_TEMPLATE.format(title_id=title_id),
+            'comments': self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            ),
+        }
+
+    @pytest.mark.parametrize('name', ('title', 'reviews', 'comments'))
+    def test_01_not_modified(self, client, urls, name,
+                             django_assert_num_queries):
+        response = client.get(urls[name])
+        etag = response['ETag']
+        assert etag, (
+            f'Проверьте, что ответ на GET-запрос к `{urls[name]}` содержит '
+            'заголовок ETag.'
+        )
+        # Только номера поколений, без запроса строк.
+        with django_assert_num_queries(1):
+            response = client.get(urls[name], HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что GET-запрос с актуальным If-None-Match к '
+            f'`{urls[name]}` возвращает ответ со статусом 304.'
+        )
+        assert response['ETag'] == etag
+        assert not response.content
+
+    def test_02_etag_changes_after_writes(self, client, admin_client,
+                                          user_client, urls):
+        etags = {name: client.get(url)['ETag'] for name, url in urls.items()}
+        response = user_client.post(urls['comments'], data={'text': 'Ещё'})
+        assert response.status_code == HTTPStatus.CREATED
+        assert client.get(
+            urls['comments'], HTTP_IF_NONE_MATCH=etags['comments']
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что новый комментарий меняет ETag списка '
+            'комментариев.'
+        )
+        assert client.get(
+            urls['reviews'], HTTP_IF_NONE_MATCH=etags['reviews']
+        ).status_code == HTTPStatus.NOT_MODIFIED
+
+        reviews = client.get(urls['reviews']).json()['results']
+        review = next(
+            review for review in reviews if review['author'] == 'TestUser'
+        )
+        user_client.patch(f'{urls["reviews"]}{review["id"]}/',
+                          data={'score': 1})
+        for name in ('title', 'reviews', 'comments'):
+            assert client.get(
+                urls[name], HTTP_IF_NONE_MATCH=etags[name]
+            ).status_code == HTTPStatus.OK, (
+                'Проверьте, что изменение оценки отзыва меняет ETag '
+                f'`{urls[name]}`.'
+            )
+
+        user_client.patch('/api/v1/users/me/', data={'username': 'renamed'})
+        etag = client.get(urls['reviews'])['ETag']
+        admin_client.delete(urls['title'])
+        assert client.get(
+            urls['reviews'], HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_etag_is_shared_between_processes(self, client, user_client,
+                                                 urls, settings):
+        etag = client.get(urls['comments'])['ETag']
+        # Запись обрабатывает процесс с другим локальным кешем.
+        settings.CACHES = {
+            **settings.CACHES,
+            'worker': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'worker',
+            },
+        }
+        settings.API_CACHE_ALIAS = 'worker'
+        response = user_client.post(urls['comments'], data={'text': 'Ещё'})
+        assert response.status_code == HTTPStatus.CREATED
+        settings.API_CACHE_ALIAS = 'default'
+        assert client.get(
+            urls['comments'], HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag меняется и в процессах, чей кеш не видел '
+            'записи.'
+        )
+
+    def test_04_orm_writes_change_etag(self, client, urls):
+        from django.core.management import call_command
+
+        from reviews.models import Comment, Review
+
+        etags = {name: client.get(url)['ETag'] for name, url in urls.items()}
+        title = client.get(urls['title']).json()
+        review = Review.objects.get(id=client.get(
+            urls['reviews']
+        ).json()['results'][0]['id'])
+        review.score = 10 if review.score != 10 else 1
+        review.save()
+        assert client.get(
+            urls['reviews'], HTTP_IF_NONE_MATCH=etags['reviews']
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что сохранение отзыва через ORM меняет ETag '
+            'списка отзывов.'
+        )
+        call_command('rebuild_ratings')
+        assert client.get(
+            urls['title'], HTTP_IF_NONE_MATCH=etags['title']
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что `rebuild_ratings` меняет ETag произведения.'
+        )
+        assert client.get(urls['title']).json()['rating'] != title['rating'], (
+            'Проверьте, что кеш ответов не отдаёт рейтинг до пересчёта.'
+        )
+
+        review_id = urls['comments'].split('/')[-3]
+        Comment.objects.filter(review_id=review_id).first().delete()
+        assert client.get(
+            urls['comments'], HTTP_IF_NONE_MATCH=etags['comments']
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что удаление комментария через ORM меняет ETag '
+            'списка комментариев.'
+        )
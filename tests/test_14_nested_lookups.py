@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14NestedLookups:
+
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+    COMMENT_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        '{comment_id}/'
+    )
+
+    @pytest.fixture
+    def feed(self, admin_client, admin):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        return titles, reviews[0]['id'], comments[0]['id']
+
+    def test_01_review_must_belong_to_title(self, client, feed):
+        titles, review_id, comment_id = feed
+        for url in (
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[1]['id'], review_id=review_id
+            ),
+            self.COMMENT_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[1]['id'], review_id=review_id,
+                comment_id=comment_id
+            ),
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[1]['id'], review_id=review_id
+            ),
+        ):
+            assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что `{url}` возвращает 404, если отзыв не '
+                'относится к произведению из URL.'
+            )
+
+    def test_02_detail_without_parent_query(self, client, feed,
+                                            django_assert_num_queries):
+        titles, review_id, comment_id = feed
+        # Номер поколения и объект вместе с проверкой родителя и автором.
+        with django_assert_num_queries(2):
+            client.get(self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=review_id
+            ))
+        with django_assert_num_queries(2):
+            client.get(self.COMMENT_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=review_id,
+                comment_id=comment_id
+            ))
+
+    def test_03_comment_post_loads_review_once(self, admin_client, feed,
+                                               django_assert_num_queries):
+        titles, review_id, _ = feed
+        # Пользователь, отзыв с проверкой произведения, вставка
+        # и номер поколения комментариев.
+        with django_assert_num_queries(4):
+            response = admin_client.post(
+                self.COMMENTS_URL_TEMPLATE.format(
+                    title_id=titles[0]['id'], review_id=review_id
+                ),
+                data={'text': 'Ещё комментарий'}
+            )
+        assert response.status_code == HTTPStatus.CREATED
@@ -0,0 +1,119 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+
+
+class FailingEmailBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+class ObservingEmailBackend(BaseEmailBackend):
+
+    observed = []
+
+    def send_messages(self, email_messages):
+        from django.conf import settings
+        from django.db import connection
+
+        from reviews.models import OutboxEmail
+        from reviews.outbox import get_pending_emails
+
+        self.observed.append(
+            (connection.in_atomic_block, get_pending_emails().exists())
+        )
+        # Письмо, поставленное в очередь во время отправки.
+        OutboxEmail.objects.create(
+            subject='Тема', body='Текст', from_email=settings.SENDER_EMAIL,
+            recipient='late@yamdb.fake'
+        )
+        return len(email_messages)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    @pytest.fixture(autouse=True)
+    def queued_delivery(self, settings):
+        settings.EMAIL_OUTBOX_EAGER = False
+
+    def sign_up(self, client, number):
+        response = client.post(self.URL_SIGNUP, data={
+            'email': f'newcomer{number}@yamdb.fake',
+            'username': f'newcomer{number}'
+        })
+        assert response.status_code == HTTPStatus.OK
+
+    def test_01_signup_enqueues_email(self, client, django_user_model):
+        from reviews.models import OutboxEmail
+
+        for number in range(3):
+            self.sign_up(client, number)
+        assert len(mail.outbox) == 0, (
+            f'Проверьте, что POST-запрос к `{self.URL_SIGNUP}` не отправляет '
+            'письмо сам, а ставит его в очередь.'
+        )
+        assert OutboxEmail.objects.filter(sent_at__isnull=True).count() == 3
+
+        call_command('send_emails', '--batch-size', '2')
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            f'newcomer{number}@yamdb.fake' for number in range(3)
+        ]
+        user = django_user_model.objects.get(username='newcomer0')
+        assert user.confirmation_code in mail.outbox[0].body
+        assert not OutboxEmail.objects.filter(sent_at__isnull=True).exists()
+
+        call_command('send_emails')
+        assert len(mail.outbox) == 3, (
+            'Проверьте, что отправленные письма не отправляются повторно.'
+        )
+
+    def test_02_failed_email_is_retried(self, client, settings):
+        from reviews.models import OutboxEmail
+
+        self.sign_up(client, 0)
+        settings.EMAIL_BACKEND = (
+            'tests.test_15_email_outbox.FailingEmailBackend'
+        )
+        call_command('send_emails')
+        email = OutboxEmail.objects.get()
+        assert email.sent_at is None
+        assert email.attempts == 1
+        assert 'SMTP недоступен' in email.last_error
+
+        settings.EMAIL_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend'
+        )
+        call_command('send_emails')
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что повторная отправка ждёт окончания задержки.'
+        )
+        OutboxEmail.objects.update(next_attempt_at=email.created)
+        call_command('send_emails')
+        assert len(mail.outbox) == 1
+        email.refresh_from_db()
+        assert email.sent_at is not None
+        assert email.attempts == 2
+
+    def test_03_sending_holds_no_transaction(self, client, settings):
+        from reviews.models import OutboxEmail
+        from reviews.outbox import get_pending_emails, send_pending_emails
+
+        self.sign_up(client, 0)
+        ObservingEmailBackend.observed = []
+        settings.EMAIL_BACKEND = (
+            'tests.test_15_email_outbox.ObservingEmailBackend'
+        )
+        assert send_pending_emails() == (1, 0)
+        assert ObservingEmailBackend.observed == [(False, False)], (
+            'Проверьте, что письма отправляются вне транзакции, а взятые '
+            'в отправку письма скрыты от других отправителей.'
+        )
+        assert OutboxEmail.objects.filter(sent_at__isnull=False).count() == 1
+        assert get_pending_emails().get().recipient == 'late@yamdb.fake'
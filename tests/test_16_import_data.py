@@ -0,0 +1,105 @@
+import csv
+import json
+import os
+import shutil
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from tests.conftest import MANAGE_PATH
+
+DATA_DIR = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ImportData:
+
+    def test_01_import_all_files(self, tmp_path):
+        from reviews.generations import get_generations
+        from reviews.models import Comment, Genre, Review, Title, User
+
+        call_command(
+            'import_data', '--batch-size', '7',
+            '--state', str(tmp_path / 'state.json')
+        )
+        assert User.objects.count() == 5
+        assert Title.objects.count() == 32
+        assert Title.genre.through.objects.count() == 42
+        assert Genre.objects.get(slug='drama').name == 'Драма'
+        review = Review.objects.get(id=1)
+        assert (review.author_id, review.score) == (100, 10)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что импорт сохраняет дату публикации из файла.'
+        )
+        assert Comment.objects.filter(review_id=6).count() == 3
+        call_command('rebuild_ratings', '--check')
+        assert not (tmp_path / 'state.json').exists()
+        assert all(get_generations(['titles', 'genres', 'reviews:1'])), (
+            'Проверьте, что импорт сбрасывает кеш ответов.'
+        )
+
+    def test_02_resume_after_failure(self, tmp_path):
+        from reviews.models import Review
+
+        data_dir = tmp_path / 'data'
+        shutil.copytree(DATA_DIR, data_dir)
+        with open(data_dir / 'review.csv', 'a', encoding='utf-8') as file:
+            file.write('\n1000,1,Битая строка,104,десять,2020-01-01T00:00Z')
+        state = str(tmp_path / 'state.json')
+        with pytest.raises(CommandError):
+            call_command(
+                'import_data', '--path', str(data_dir),
+                '--batch-size', '50', '--state', state
+            )
+        assert Review.objects.count() == 50, (
+            'Проверьте, что части файла до ошибки остаются в БД.'
+        )
+        assert os.path.exists(state)
+
+        with open(data_dir / 'review.csv', encoding='utf-8') as file:
+            fixed = file.read().replace(',десять,', ',10,')
+        with open(data_dir / 'review.csv', 'w', encoding='utf-8') as file:
+            file.write(fixed)
+        call_command(
+            'import_data', '--path', str(data_dir),
+            '--batch-size', '50', '--state', state
+        )
+        assert Review.objects.count() == 73
+        assert not os.path.exists(state)
+
+    def test_03_replay_last_checkpointed_chunk(self, tmp_path):
+        from reviews.models import Comment, Review
+
+        state = tmp_path / 'state.json'
+        call_command(
+            'import_data', '--batch-size', '50', '--state', str(state)
+        )
+        # Сбой после фиксации последней части, но до записи прогресса.
+        state.write_text(json.dumps({
+            'users.csv': 5, 'category.csv': 3, 'genre.csv': 15,
+            'titles.csv': 32, 'genre_title.csv': 42, 'review.csv': 50,
+        }))
+        Comment.objects.all().delete()
+        with open(os.path.join(DATA_DIR, 'review.csv'),
+                  encoding='utf-8', newline='') as file:
+            replayed = [row[0] for row in csv.reader(file)][51:54]
+        Review.objects.filter(id__in=replayed).delete()
+        call_command(
+            'import_data', '--batch-size', '50', '--state', str(state)
+        )
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 3
+
+    def test_04_conflicts_are_not_skipped(self, tmp_path):
+        from reviews.models import Genre
+
+        Genre.objects.create(id=3, name='Уже есть', slug='existing')
+        with pytest.raises(CommandError, match='genre.csv в строках 2-8'):
+            call_command(
+                'import_data', '--batch-size', '7',
+                '--state', str(tmp_path / 'state.json')
+            )
+        assert not Genre.objects.filter(slug='drama').exists(), (
+            'Проверьте, что часть с конфликтующей строкой не записывается.'
+        )
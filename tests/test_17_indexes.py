@@ -0,0 +1,70 @@
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17Indexes:
+
+    @pytest.fixture
+    def dataset(self, django_user_model):
+        from reviews.models import Category, Comment, Genre, Review, Title
+
+        category = Category.objects.create(name='Фильм', slug='films')
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр {number}', slug=f'genre-{number}')
+            for number in range(20)
+        )
+        genres = list(Genre.objects.all())
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {number}', year=1900 + number % 100,
+                  category=category)
+            for number in range(500)
+        )
+        titles = list(Title.objects.all())
+        Title.genre.through.objects.bulk_create(
+            Title.genre.through(title=title, genre=genres[index % 20])
+            for index, title in enumerate(titles)
+        )
+        author = django_user_model.objects.create(
+            username='reader', email='reader@yamdb.fake'
+        )
+        reviews = [
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=5
+            )
+            for title in titles[:50]
+        ]
+        Comment.objects.bulk_create(
+            Comment(review=reviews[0], author=author, text='Ответ')
+            for _ in range(50)
+        )
+        return titles[0], reviews[0]
+
+    # Запрос задан параметрами TitleFilter или функцией от
+    # (произведение, отзыв).
+    @pytest.mark.parametrize('index,query', (
+        ('title_year_name_idx', {'year': 1994}),
+        ('title_name_idx', {'name': 'Произведение 7'}),
+        ('reviews_title_genre_genre_title_idx', {'genre': 'genre-0'}),
+        ('review_title_feed_idx',
+         lambda title, review: title.reviews.order_by('-pub_date', 'id')),
+        ('comment_review_feed_idx',
+         lambda title, review: review.comments.order_by('-pub_date', 'id')),
+    ))
+    def test_01_planner_uses_index(self, dataset, index, query):
+        from django.db import connection
+        from api.filters import TitleFilter
+        from reviews.models import Title
+
+        if connection.vendor != 'sqlite':
+            pytest.skip('План запроса проверяется на SQLite.')
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        if isinstance(query, dict):
+            queryset = TitleFilter(query, queryset=Title.objects.all()).qs
+        else:
+            queryset = query(*dataset)
+        plan = queryset.explain()
+        assert index in plan, (
+            f'Проверьте, что для запроса используется индекс `{index}`. '
+            f'План запроса:\n{plan}'
+        )
@@ -0,0 +1,114 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Search:
+
+    URL = '/api/v1/search/'
+
+    @pytest.fixture
+    def dataset(self, admin):
+        from reviews.models import Category, Comment, Review, Title
+
+        category = Category.objects.create(name='Фильм', slug='films')
+        title = Title.objects.create(
+            name='Солярис', year=1972, category=category,
+            description='Экранизация романа Станислава Лема'
+        )
+        other = Title.objects.create(
+            name='Сталкер', year=1979, category=category
+        )
+        review = Review.objects.create(
+            title=other, author=admin, score=9,
+            text='Медленный и гипнотический фильм, совсем не похож на Солярис'
+        )
+        comment = Comment.objects.create(
+            review=review, author=admin, text='Зона и Солярис - о совести'
+        )
+        return title, review, comment
+
+    def search(self, client, **params):
+        response = client.get(self.URL, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.URL}` возвращает '
+            'статус 200.'
+        )
+        return response.json()
+
+    def test_01_finds_all_kinds(self, client, dataset):
+        title, review, comment = dataset
+        data = self.search(client, q='солярис')
+        found = {(item['type'], item['id']) for item in data['results']}
+        assert found == {
+            ('title', title.id),
+            ('review', review.id),
+            ('comment', comment.id),
+        }, (
+            'Проверьте, что поиск без учёта регистра находит произведения, '
+            'отзывы и комментарии.'
+        )
+        by_type = {item['type']: item for item in data['results']}
+        assert by_type['comment']['title_id'] == review.title_id
+        assert by_type['comment']['review_id'] == review.id
+        assert '[Солярис]' in by_type['comment']['snippet'], (
+            'Проверьте, что найденные слова выделяются во фрагменте.'
+        )
+        ranks = [item['rank'] for item in data['results']]
+        assert ranks == sorted(ranks, reverse=True), (
+            'Проверьте, что результаты упорядочены по релевантности.'
+        )
+
+    def test_02_filter_by_type(self, client, dataset):
+        title, _, _ = dataset
+        data = self.search(client, q='Солярис', type='title')
+        assert [item['id'] for item in data['results']] == [title.id]
+        assert self.search(client, q='Лема')['results'][0]['id'] == title.id
+
+    def test_03_index_follows_writes(self, client, dataset):
+        title, review, comment = dataset
+        review.text = 'Отзыв о тишине'
+        review.save()
+        comment.delete()
+        title.name = 'Solaris'
+        title.save()
+        assert {
+            item['type'] for item in self.search(client, q='Солярис')[
+                'results'
+            ]
+        } == set(), (
+            'Проверьте, что индекс обновляется при изменении и удалении.'
+        )
+        found = self.search(client, q='тишине')['results']
+        assert [item['id'] for item in found] == [review.id]
+        found = self.search(client, q='solaris')['results']
+        assert [item['id'] for item in found] == [title.id]
+
+    def test_04_pagination(self, client, admin):
+        from reviews.models import Category, Title
+
+        category = Category.objects.create(name='Фильм', slug='films')
+        Title.objects.bulk_create(
+            Title(name=f'Сказка {number}', year=2000, category=category)
+            for number in range(15)
+        )
+        first = self.search(client, q='сказка')
+        assert len(first['results']) == 10
+        assert first['previous'] is None
+        assert first['next'] is not None
+        second = client.get(first['next']).json()
+        assert len(second['results']) == 5
+        assert second['next'] is None
+        assert second['previous'] is not None
+        ids = {item['id'] for item in first['results'] + second['results']}
+        assert len(ids) == 15
+
+    def test_05_query_is_escaped(self, client, dataset):
+        for query in ('"', 'NOT AND', 'Солярис OR', '*', 'name:Солярис'):
+            self.search(client, q=query)
+
+    def test_06_bad_request(self, client):
+        for params in ({}, {'q': 'x', 'type': 'user'}, {'q': 'x', 'page': 0}):
+            response = client.get(self.URL, params)
+            assert response.status_code == HTTPStatus.BAD_REQUEST
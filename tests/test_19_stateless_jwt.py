@@ -0,0 +1,90 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19StatelessJWT:
+
+    TOKEN_URL = '/api/v1/auth/token/'
+    ME_URL = '/api/v1/users/me/'
+    USERS_URL = '/api/v1/users/'
+
+    def get_client(self, user):
+        user.confirmation_code = '12345678'
+        user.save()
+        response = APIClient().post(self.TOKEN_URL, {
+            'username': user.username,
+            'confirmation_code': '12345678',
+        })
+        assert response.status_code == HTTPStatus.OK
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}'
+        )
+        return client
+
+    def test_01_token_contains_claims(self, client, admin):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        admin.confirmation_code = '12345678'
+        admin.save()
+        token = AccessToken(client.post(self.TOKEN_URL, {
+            'username': admin.username,
+            'confirmation_code': '12345678',
+        }).json()['token'])
+        assert token['username'] == admin.username
+        assert token['role'] == admin.role
+        assert token['is_staff'] == admin.is_staff
+
+    def test_02_no_user_query_within_ttl(
+        self, admin, django_assert_num_queries
+    ):
+        client = self.get_client(admin)
+        url = f'{self.USERS_URL}?search=nobody'
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        # Пустой список пользователей - один COUNT, без чтения
+        # пользователя из токена.
+        with django_assert_num_queries(1):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что повторный запрос с токеном не читает '
+            'пользователя из БД.'
+        )
+
+    def test_03_profile_has_all_fields(self, user):
+        client = self.get_client(user)
+        response = client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['email'] == user.email
+        response = client.patch(self.ME_URL, {'bio': 'Читатель'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['email'] == user.email
+        user.refresh_from_db()
+        assert user.bio == 'Читатель'
+
+    def test_04_revocation(self, admin, user):
+        client = self.get_client(user)
+        assert client.get(self.ME_URL).status_code == HTTPStatus.OK
+        user.role = 'moderator'
+        user.save()
+        assert client.get(self.ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что токен с устаревшей ролью отклоняется.'
+        )
+        client = self.get_client(user)
+        assert client.get(self.ME_URL).status_code == HTTPStatus.OK
+        user.is_active = False
+        user.save()
+        assert client.get(self.ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что токен заблокированного пользователя отклоняется.'
+        )
+
+    def test_05_token_without_claims(self, admin_client):
+        response = admin_client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.OK
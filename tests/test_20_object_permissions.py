@@ -0,0 +1,58 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20ObjectPermissions:
+
+    COMMENT_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+        '{comment_id}/'
+    )
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    @pytest.fixture
+    def feed(self, admin_client, admin):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        return titles[0]['id'], reviews[0]['id'], comments[0]['id']
+
+    def user_queries(self, queries):
+        return [
+            query['sql'] for query in queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_user"' in query['sql']
+        ]
+
+    def test_01_moderator_patch_comment(self, moderator_client, feed):
+        title_id, review_id, comment_id = feed
+        url = self.COMMENT_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id, comment_id=comment_id
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = moderator_client.patch(url, data={'text': 'Правка'})
+        assert response.status_code == HTTPStatus.OK
+        assert len(self.user_queries(context.captured_queries)) == 1, (
+            'Проверьте, что при PATCH-запросе модератора к комментарию '
+            'пользователи читаются из БД только при аутентификации.'
+        )
+
+    def test_02_author_and_stranger(self, admin_client, user_client, feed):
+        title_id, review_id, comment_id = feed
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id
+        )
+        response = user_client.patch(url, data={'text': 'Чужая правка'})
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.patch(url, data={'text': 'Правка'})
+        assert response.status_code == HTTPStatus.OK
+        assert len(self.user_queries(context.captured_queries)) == 1
@@ -0,0 +1,65 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21FeedAuthors:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def make_feed(self, django_user_model, size):
+        from reviews.models import Category, Comment, Review, Title
+
+        category = Category.objects.create(name='Фильм', slug='films')
+        title = Title.objects.create(name='Сталкер', year=1979,
+                                     category=category)
+        django_user_model.objects.bulk_create(
+            django_user_model(username=f'reader{number}',
+                              email=f'reader{number}@yamdb.fake')
+            for number in range(size)
+        )
+        authors = list(django_user_model.objects.filter(
+            username__startswith='reader'
+        ))
+        reviews = [
+            Review.objects.create(title=title, author=author, text='Отзыв',
+                                  score=7)
+            for author in authors
+        ]
+        Comment.objects.bulk_create(
+            Comment(review=reviews[0], author=author, text='Ответ')
+            for author in authors
+        )
+        return title.id, reviews[0].id
+
+    @pytest.mark.parametrize('size', (1, 8))
+    def test_01_list_queries_do_not_grow(self, client, django_user_model,
+                                         size):
+        title_id, review_id = self.make_feed(django_user_model, size)
+        for url in (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title_id),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            ),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            data = response.json()['results']
+            assert len(data) == size
+            assert all(item['author'].startswith('reader') for item in data)
+            # Номер поколения, родитель из URL, COUNT и страница
+            # вместе с авторами.
+            assert len(context.captured_queries) == 4, (
+                f'Проверьте, что `{url}` получает авторов тем же запросом, '
+                'что и страницу.'
+            )
+            page_sql = context.captured_queries[-1]['sql']
+            assert '"reviews_user"."username"' in page_sql
+            assert '"reviews_user"."email"' not in page_sql, (
+                'Проверьте, что из таблицы пользователей читаются только '
+                'нужные сериализатору колонки.'
+            )
@@ -0,0 +1,163 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22BulkReviews:
+
+    BULK_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/bulk/'
+    CROSS_TITLE_URL = '/api/v1/reviews/bulk/'
+    COMMENTS_BULK_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/bulk/'
+    )
+
+    @pytest.fixture
+    def titles(self):
+        from reviews.models import Category, Title
+
+        category = Category.objects.create(name='Фильм', slug='films')
+        return [
+            Title.objects.create(name=name, year=1979, category=category)
+            for name in ('Сталкер', 'Солярис')
+        ]
+
+    @pytest.fixture
+    def readers(self, django_user_model):
+        return [
+            django_user_model.objects.create(
+                username=f'reader{number}', email=f'reader{number}@yamdb.fake'
+            )
+            for number in range(3)
+        ]
+
+    def test_01_admin_creates_reviews_for_authors(
+        self, admin_client, titles, readers
+    ):
+        from reviews.models import Title
+
+        title = titles[0]
+        response = admin_client.post(
+            self.BULK_URL_TEMPLATE.format(title_id=title.id),
+            data=[
+                {'text': 'Отлично', 'score': 10, 'author': 'reader0'},
+                {'text': 'Хорошо', 'score': 8, 'author': 'reader1'},
+                {'text': 'Нормально', 'score': 6},
+            ],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что пакет без ошибок создаётся со статусом 201.'
+        )
+        data = response.json()
+        assert [item['status'] for item in data] == [201, 201, 201]
+        assert [item['data']['author'] for item in data][:2] == [
+            'reader0', 'reader1'
+        ]
+        assert all(item['data']['id'] for item in data)
+        title = Title.objects.get(id=title.id)
+        assert title.reviews.count() == 3
+        assert (title.rating_sum, title.rating_count) == (24, 3)
+        assert title.rating == 8
+
+    def test_02_per_item_errors(self, admin_client, titles, readers):
+        from reviews.models import Review, Title
+
+        title = titles[0]
+        Review.objects.create(
+            title=title, author=readers[2], text='Был', score=5
+        )
+        Title.objects.refresh_rating()
+        response = admin_client.post(
+            self.BULK_URL_TEMPLATE.format(title_id=title.id),
+            data=[
+                {'text': 'Отлично', 'score': 10, 'author': 'reader0'},
+                {'text': 'Повтор', 'score': 1, 'author': 'reader0'},
+                {'text': 'Старый автор', 'score': 1, 'author': 'reader2'},
+                {'text': 'Нет автора', 'score': 1, 'author': 'nobody'},
+                {'text': 'Плохая оценка', 'score': 11},
+            ],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.MULTI_STATUS, (
+            'Проверьте, что частично принятый пакет возвращает статус 207.'
+        )
+        assert [item['status'] for item in response.json()] == [
+            201, 400, 400, 400, 400
+        ]
+        title = Title.objects.get(id=title.id)
+        assert (title.rating_sum, title.rating_count) == (15, 2)
+
+    def test_03_user_cannot_set_author(self, user_client, titles, readers):
+        response = user_client.post(
+            self.BULK_URL_TEMPLATE.format(title_id=titles[0].id),
+            data=[{'text': 'Чужой', 'score': 5, 'author': 'reader0'}],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = user_client.post(
+            self.BULK_URL_TEMPLATE.format(title_id=titles[0].id),
+            data=[{'text': 'Свой', 'score': 5}],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED
+
+    def test_04_cross_title(self, admin_client, user_client, titles,
+                            readers):
+        from reviews.models import Title
+
+        data = [
+            {'title': titles[0].id, 'text': 'А', 'score': 4,
+             'author': 'reader0'},
+            {'title': titles[1].id, 'text': 'Б', 'score': 6,
+             'author': 'reader0'},
+            {'title': titles[1].id, 'text': 'В', 'score': 8,
+             'author': 'reader1'},
+            {'title': 0, 'text': 'Г', 'score': 8, 'author': 'reader1'},
+            {'text': 'Д', 'score': 8, 'author': 'reader1'},
+        ]
+        response = user_client.post(self.CROSS_TITLE_URL, data=data,
+                                    format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что пакет отзывов к разным произведениям доступен '
+            'только администратору.'
+        )
+        response = admin_client.post(self.CROSS_TITLE_URL, data=data,
+                                     format='json')
+        assert response.status_code == HTTPStatus.MULTI_STATUS
+        assert [item['status'] for item in response.json()] == [
+            201, 201, 201, 400, 400
+        ]
+        assert Title.objects.get(id=titles[0].id).rating == 4
+        assert Title.objects.get(id=titles[1].id).rating == 7
+
+    def test_05_bad_payload(self, admin_client, titles, settings):
+        url = self.BULK_URL_TEMPLATE.format(title_id=titles[0].id)
+        settings.BULK_MAX_ITEMS = 2
+        for data in ({'text': 'Не список', 'score': 5}, [],
+                     [{'text': 'Отзыв', 'score': 5}] * 3):
+            response = admin_client.post(url, data=data, format='json')
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_06_bulk_comments(self, admin_client, titles, readers):
+        from reviews.models import Review
+
+        review = Review.objects.create(
+            title=titles[0], author=readers[0], text='Отзыв', score=5
+        )
+        response = admin_client.post(
+            self.COMMENTS_BULK_URL_TEMPLATE.format(
+                title_id=titles[0].id, review_id=review.id
+            ),
+            data=[
+                {'text': 'Согласен', 'author': 'reader1'},
+                {'text': 'Спасибо'},
+                {'text': ''},
+            ],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.MULTI_STATUS
+        assert [item['status'] for item in response.json()] == [
+            201, 201, 400
+        ]
+        assert review.comments.count() == 2
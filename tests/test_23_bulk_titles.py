@@ -0,0 +1,101 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23BulkTitles:
+
+    URL = '/api/v1/titles/bulk/'
+
+    @pytest.fixture
+    def catalog(self):
+        from reviews.models import Category, Genre
+
+        Category.objects.bulk_create((
+            Category(name='Фильм', slug='films'),
+            Category(name='Книга', slug='books'),
+        ))
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр {number}', slug=f'genre-{number}')
+            for number in range(5)
+        )
+
+    def test_01_create(self, admin_client, catalog,
+                       django_assert_max_num_queries):
+        from reviews.models import Title
+
+        data = [
+            {'name': f'Фильм {number}', 'year': 2000 + number,
+             'category': 'films',
+             'genre': [f'genre-{number % 5}', f'genre-{(number + 1) % 5}']}
+            for number in range(20)
+        ]
+        # Число запросов не зависит от размера пакета, кроме вставки
+        # произведений по одной там, где bulk_create не возвращает ключи.
+        with django_assert_max_num_queries(12 + len(data)):
+            response = admin_client.post(self.URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что пакет произведений без ошибок создаётся '
+            'со статусом 201.'
+        )
+        results = response.json()
+        assert [item['status'] for item in results] == [201] * 20
+        assert results[3]['data']['category']['slug'] == 'films'
+        assert {genre['slug'] for genre in results[3]['data']['genre']} == {
+            'genre-3', 'genre-4'
+        }
+        assert Title.objects.count() == 20
+        assert Title.genre.through.objects.count() == 40
+
+    def test_02_upsert_and_errors(self, admin_client, catalog):
+        from reviews.models import Title
+
+        response = admin_client.post(self.URL, data=[
+            {'name': 'Солярис', 'year': 1972, 'category': 'films',
+             'genre': ['genre-0']},
+        ], format='json')
+        title_id = response.json()[0]['data']['id']
+        response = admin_client.post(self.URL, data=[
+            {'id': title_id, 'category': 'books',
+             'genre': ['genre-1', 'genre-2']},
+            {'name': 'Сталкер', 'year': 1979, 'category': 'films',
+             'genre': ['genre-0']},
+            {'name': 'Без жанра', 'year': 1979, 'category': 'films',
+             'genre': ['missing']},
+            {'name': 'Без категории', 'year': 1979, 'category': 'missing',
+             'genre': []},
+            {'name': 'Из будущего', 'year': 3000, 'category': 'films',
+             'genre': []},
+            {'id': 0, 'name': 'Нет такого'},
+            {'year': 1979},
+        ], format='json')
+        assert response.status_code == HTTPStatus.MULTI_STATUS, (
+            'Проверьте, что частично принятый пакет возвращает статус 207.'
+        )
+        assert [item['status'] for item in response.json()] == [
+            200, 201, 400, 400, 400, 400, 400
+        ]
+        title = Title.objects.get(id=title_id)
+        assert title.name == 'Солярис'
+        assert title.category.slug == 'books'
+        assert sorted(title.genre.values_list('slug', flat=True)) == [
+            'genre-1', 'genre-2'
+        ]
+        assert Title.objects.count() == 2
+
+    def test_03_admin_only(self, user_client, moderator_client, catalog):
+        data = [{'name': 'Фильм', 'year': 2000, 'category': 'films',
+                 'genre': []}]
+        for client in (user_client, moderator_client):
+            response = client.post(self.URL, data=data, format='json')
+            assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_04_list_cache_is_invalidated(self, admin_client, client,
+                                          catalog):
+        assert client.get('/api/v1/titles/').json()['count'] == 0
+        admin_client.post(self.URL, data=[
+            {'name': 'Фильм', 'year': 2000, 'category': 'films',
+             'genre': ['genre-0']},
+        ], format='json')
+        assert client.get('/api/v1/titles/').json()['count'] == 1
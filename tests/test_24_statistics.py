@@ -0,0 +1,114 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Statistics:
+
+    GENRE_URL = '/api/v1/genres/{slug}/statistics/'
+    GENRES_URL = '/api/v1/genres/statistics/'
+    CATEGORY_URL = '/api/v1/categories/{slug}/statistics/'
+
+    @pytest.fixture
+    def catalog(self, django_user_model):
+        from reviews.models import Category, Genre, Review, Title
+
+        films = Category.objects.create(name='Фильм', slug='films')
+        Category.objects.create(name='Книга', slug='books')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        Genre.objects.create(name='Комедия', slug='comedy')
+        authors = [
+            django_user_model.objects.create(
+                username=f'reader{number}', email=f'reader{number}@yamdb.fake'
+            )
+            for number in range(3)
+        ]
+        for number, scores in enumerate(((10, 8), (6,), (), (4, 2, 3))):
+            title = Title.objects.create(
+                name=f'Фильм {number}', year=2000, category=films
+            )
+            title.genre.set([drama])
+            for author, score in zip(authors, scores):
+                Review.objects.create(
+                    title=title, author=author, text='Отзыв', score=score
+                )
+        Title.objects.refresh_rating()
+
+    def test_01_refresh_command(self, client, catalog, settings):
+        settings.STATISTICS_TOP_TITLES = 2
+        call_command('refresh_statistics')
+        response = client.get(self.GENRE_URL.format(slug='drama'))
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['slug'] == 'drama'
+        assert data['title_count'] == 4
+        assert data['review_count'] == 6
+        assert data['mean_rating'] == pytest.approx((9 + 6 + 3) / 3)
+        assert [title['name'] for title in data['top_titles']] == [
+            'Фильм 0', 'Фильм 1'
+        ], (
+            'Проверьте, что в показателях хранятся произведения с лучшим '
+            'рейтингом.'
+        )
+        data = client.get(self.GENRE_URL.format(slug='comedy')).json()
+        assert (data['title_count'], data['mean_rating']) == (0, None)
+        data = client.get(self.CATEGORY_URL.format(slug='films')).json()
+        assert data['title_count'] == 4
+
+    def test_02_single_lookup(self, client, catalog,
+                              django_assert_num_queries):
+        call_command('refresh_statistics')
+        with django_assert_num_queries(1):
+            response = client.get(self.GENRE_URL.format(slug='drama'))
+        assert response.status_code == HTTPStatus.OK
+        response = client.get(self.GENRES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert [item['slug'] for item in response.json()['results']] == [
+            'comedy', 'drama'
+        ]
+
+    def test_03_missing_statistics(self, client, catalog):
+        response = client.get(self.GENRE_URL.format(slug='drama'))
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что показатели ещё не пересчитанного жанра '
+            'вычисляются при запросе.'
+        )
+        assert response.json()['title_count'] == 4
+        response = client.get(self.GENRE_URL.format(slug='missing'))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_concurrent_first_read(self, client, catalog, monkeypatch):
+        from reviews.models import GenreStatistics
+
+        bulk_create = GenreStatistics.objects.bulk_create
+
+        def racing_bulk_create(objs, **kwargs):
+            # Другой запрос сохранил показатели после удаления старых.
+            bulk_create([GenreStatistics(
+                genre_id=obj.genre_id, title_count=obj.title_count,
+                review_count=obj.review_count, top_titles=obj.top_titles
+            ) for obj in objs])
+            return bulk_create(objs, **kwargs)
+
+        monkeypatch.setattr(
+            GenreStatistics.objects, 'bulk_create', racing_bulk_create
+        )
+        response = client.get(self.GENRE_URL.format(slug='drama'))
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что одновременный первый запрос показателей '
+            'не приводит к ошибке.'
+        )
+        assert response.json()['title_count'] == 4
+
+    def test_05_reserved_slug(self, admin_client):
+        for url in ('/api/v1/genres/', '/api/v1/categories/'):
+            response = admin_client.post(
+                url, data={'name': 'Показатели', 'slug': 'statistics'}
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                'Проверьте, что слаг `statistics` занят адресом '
+                'списка показателей.'
+            )
+            assert 'slug' in response.json()
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25RatingOrdering:
+
+    URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        from reviews.models import Category, Title
+
+        category = Category.objects.create(name='Фильм', slug='films')
+        ratings = (7.0, None, 9.5, 7.0, 3.0, None, 7.0)
+        Title.objects.bulk_create(
+            Title(name=f'Фильм {number}', year=2000, category=category,
+                  rating=rating)
+            for number, rating in enumerate(ratings)
+        )
+        return list(Title.objects.order_by('id'))
+
+    def get_ids(self, client, params):
+        response = client.get(self.URL, params)
+        assert response.status_code == HTTPStatus.OK
+        return [title['id'] for title in response.json()['results']]
+
+    def test_01_ordering_by_rating(self, client, titles):
+        ids = [title.id for title in titles]
+        assert self.get_ids(client, {'ordering': '-rating'}) == [
+            ids[2], ids[6], ids[3], ids[0], ids[4], ids[5], ids[1]
+        ], (
+            'Проверьте, что при сортировке по убыванию рейтинга равные '
+            'значения упорядочены по id, а произведения без рейтинга '
+            'идут последними.'
+        )
+        assert self.get_ids(client, {'ordering': 'rating'}) == [
+            ids[4], ids[0], ids[3], ids[6], ids[2], ids[1], ids[5]
+        ]
+
+    def test_02_rating_range(self, client, titles):
+        ids = [title.id for title in titles]
+        assert self.get_ids(
+            client, {'rating_min': 7, 'ordering': 'id'}
+        ) == [ids[0], ids[2], ids[3], ids[6]]
+        assert self.get_ids(
+            client, {'rating_min': 5, 'rating_max': 8, 'ordering': '-rating'}
+        ) == [ids[6], ids[3], ids[0]]
+        response = client.get(self.URL, {'rating_min': 'много'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_unknown_ordering_is_ignored(self, client, titles):
+        response = client.get(self.URL, {'ordering': 'genre'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == len(titles)
+
+    def test_04_planner_uses_index(self, client, titles):
+        from django.db import connection
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+        from api.filters import TitleFilter, TitleOrderingFilter
+        from reviews.models import Title
+
+        if connection.vendor != 'sqlite':
+            pytest.skip('План запроса проверяется на SQLite.')
+        Title.objects.bulk_create(
+            Title(name=f'Книга {number}', year=2000, rating=number % 10)
+            for number in range(500)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        for query in ({'ordering': '-rating'},
+                      {'rating_min': 9, 'ordering': '-rating'}):
+            queryset = TitleFilter(query, queryset=Title.objects.all()).qs
+            request = Request(APIRequestFactory().get(self.URL, query))
+            view = type('View', (), {'ordering_fields': ('rating',)})()
+            plan = TitleOrderingFilter().filter_queryset(
+                request, queryset, view
+            ).explain()
+            assert 'title_rating_idx' in plan, (
+                'Проверьте, что сортировка по рейтингу использует индекс '
+                f'`title_rating_idx`. План запроса:\n{plan}'
+            )
+            assert 'TEMP B-TREE' not in plan, plan
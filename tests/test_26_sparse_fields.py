@@ -0,0 +1,125 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26SparseFields:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    USERS_URL = '/api/v1/users/'
+
+    @pytest.fixture
+    def title(self, user):
+        from reviews.models import Category, Genre, Review, Title
+
+        category = Category.objects.create(name='Фильм', slug='films')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(
+            name='Сталкер', year=1979, category=category,
+            description='Фильм Андрея Тарковского'
+        )
+        title.genre.set([genre])
+        Review.objects.create(title=title, author=user, text='Отзыв',
+                              score=9)
+        Title.objects.refresh_rating()
+        return title
+
+    def get(self, client, url, params):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK
+        return response.json(), [
+            query['sql'] for query in context.captured_queries
+        ]
+
+    def test_01_titles_fields(self, client, title):
+        data, queries = self.get(
+            client, self.TITLES_URL, {'fields': 'id,name,rating'}
+        )
+        assert data['results'] == [
+            {'id': title.id, 'name': 'Сталкер', 'rating': 9}
+        ], (
+            'Проверьте, что параметр `fields` оставляет в ответе только '
+            'перечисленные поля.'
+        )
+        assert len(queries) == 3, (
+            'Проверьте, что без полей `genre` и `category` не выполняются '
+            'лишние запросы.'
+        )
+        assert 'description' not in queries[-1]
+        assert 'reviews_category' not in queries[-1]
+
+    def test_02_titles_omit(self, client, title):
+        data, queries = self.get(
+            client, f'{self.TITLES_URL}{title.id}/',
+            {'omit': 'genre,description'}
+        )
+        assert set(data) == {'id', 'name', 'year', 'category', 'rating'}
+        assert data['category'] == {'name': 'Фильм', 'slug': 'films'}
+        assert len(queries) == 2
+        assert 'description' not in queries[-1]
+
+    def test_03_reviews_fields(self, client, title):
+        data, queries = self.get(
+            client, self.REVIEWS_URL_TEMPLATE.format(title_id=title.id),
+            {'fields': 'id,score'}
+        )
+        assert set(data['results'][0]) == {'id', 'score'}
+        assert 'reviews_user' not in queries[-1], (
+            'Проверьте, что без поля `author` пользователи не читаются.'
+        )
+
+    def test_04_users_omit(self, admin_client, title):
+        data, queries = self.get(
+            admin_client, self.USERS_URL, {'omit': 'bio,first_name'}
+        )
+        assert 'bio' not in data['results'][0]
+        assert '"bio"' not in queries[-1]
+        data, _ = self.get(
+            admin_client, f'{self.USERS_URL}me/', {'fields': 'username'}
+        )
+        assert list(data) == ['username']
+
+    def test_05_writes_ignore_fields(self, admin_client, title):
+        response = admin_client.post(
+            f'{self.TITLES_URL}?fields=id',
+            data={'name': 'Солярис', 'year': 1972, 'genre': ['drama'],
+                  'category': 'films'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['name'] == 'Солярис'
+
+    @pytest.mark.parametrize('feed', ('reviews', 'comments'))
+    def test_06_cursor_with_fields(self, client, title, django_user_model,
+                                   feed):
+        from reviews.models import Comment, Review
+
+        authors = [
+            django_user_model.objects.create(
+                username=f'reader{number}', email=f'reader{number}@yamdb.fake'
+            )
+            for number in range(12)
+        ]
+        Review.objects.bulk_create(
+            Review(title=title, author=author, text='Отзыв', score=5)
+            for author in authors
+        )
+        review = Review.objects.filter(title=title).first()
+        Comment.objects.bulk_create(
+            Comment(review=review, author=author, text='Комментарий')
+            for author in authors
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        if feed == 'comments':
+            url = f'{url}{review.id}/comments/'
+        data, full = self.get(client, url, {'cursor': ''})
+        assert data['next']
+        _, sparse = self.get(client, url, {'cursor': '', 'fields': 'id'})
+        assert len(sparse) <= len(full), (
+            'Проверьте, что `fields` вместе с курсором не загружает '
+            'колонку `pub_date` отдельными запросами.'
+        )
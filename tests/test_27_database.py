@@ -0,0 +1,79 @@
+import runpy
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, connections
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27Database:
+
+    @pytest.fixture
+    def persistent(self, monkeypatch):
+        from api_yamdb.db import HealthCheckMixin
+
+        default = connections['default']
+        default.ensure_connection()
+        monkeypatch.setattr(default, '__class__', type(
+            'DatabaseWrapper', (HealthCheckMixin, type(default)), {}
+        ))
+        monkeypatch.setitem(default.settings_dict, 'CONN_MAX_AGE', 60)
+        checks = []
+
+        def is_usable():
+            checks.append(1)
+            return False
+
+        monkeypatch.setattr(default, 'is_usable', is_usable)
+        closed = []
+        close = default.close
+
+        def close_connection():
+            closed.append(1)
+            close()
+
+        monkeypatch.setattr(default, 'close', close_connection)
+        return checks, closed
+
+    def test_01_broken_connection_is_closed(self, client, persistent):
+        checks, closed = persistent
+        client.get('/api/v1/categories/')
+        assert closed, (
+            'Проверьте, что разорванное постоянное соединение закрывается '
+            'перед первым запросом к БД.'
+        )
+        assert len(checks) == 1, (
+            'Проверьте, что соединение проверяется не чаще раза за запрос.'
+        )
+
+    def test_02_health_checks_can_be_disabled(self, settings, persistent):
+        from api_yamdb.db import check_connections
+
+        settings.DB_HEALTH_CHECKS = False
+        check_connections()
+        connection.ensure_connection()
+        assert persistent == ([], [])
+
+    def test_03_short_connections_are_not_checked(self, monkeypatch,
+                                                  persistent):
+        from api_yamdb.db import check_connections
+
+        monkeypatch.setitem(connection.settings_dict, 'CONN_MAX_AGE', 0)
+        check_connections()
+        connection.ensure_connection()
+        assert persistent == ([], [])
+
+    def test_04_unused_connections_are_not_checked(self, persistent):
+        from api_yamdb.db import check_connections
+
+        check_connections()
+        assert persistent == ([], []), (
+            'Проверьте, что начало запроса не обращается к БД.'
+        )
+
+    def test_05_unknown_engine(self, monkeypatch):
+        from api_yamdb import settings
+
+        monkeypatch.setenv('DB_ENGINE', 'postgres')
+        with pytest.raises(ImproperlyConfigured, match='postgres'):
+            runpy.run_path(settings.__file__)
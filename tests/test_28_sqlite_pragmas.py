@@ -0,0 +1,37 @@
+import pytest
+from django.db import connection
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28SqlitePragmas:
+
+    @pytest.fixture
+    def file_connection(self, tmp_path):
+        from django.db.backends.sqlite3.base import DatabaseWrapper
+
+        wrapper = DatabaseWrapper({
+            **connection.settings_dict, 'NAME': str(tmp_path / 'db.sqlite3')
+        })
+        yield wrapper
+        wrapper.close()
+
+    def pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_01_pragmas_applied(self, file_connection):
+        assert self.pragma(file_connection, 'journal_mode') == 'wal', (
+            'Проверьте, что новое соединение с SQLite включает режим WAL.'
+        )
+        assert self.pragma(file_connection, 'synchronous') == 1
+        assert self.pragma(file_connection, 'busy_timeout') == 5000
+        assert self.pragma(file_connection, 'cache_size') == -20000
+
+    def test_02_pragmas_from_settings(self, settings, file_connection):
+        settings.SQLITE_PRAGMAS = {'busy_timeout': 100}
+        assert self.pragma(file_connection, 'busy_timeout') == 100
+        assert self.pragma(file_connection, 'journal_mode') == 'delete', (
+            'Проверьте, что применяются только PRAGMA из '
+            '`SQLITE_PRAGMAS`.'
+        )
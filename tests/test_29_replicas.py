@@ -0,0 +1,174 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from tests.conftest import MANAGE_PATH
+
+# Проект с двумя файлами SQLite: основной БД и репликой. Чтобы было
+# видно, откуда читает запрос, у реплики свои категории.
+END_TO_END_SCRIPT = """
+import json
+
+import django
+
+django.setup()
+
+from django.core.management import call_command
+from django.test import Client
+
+from api.authentication import get_token_for_user
+from reviews.models import Category, User
+
+for alias in ('default', 'replica0'):
+    call_command('migrate', database=alias, verbosity=0)
+    User.objects.using(alias).create(
+        id=1, username='admin', email='admin@yamdb.fake', role='admin'
+    )
+Category.objects.using('replica0').create(name='Реплика', slug='replica')
+token = 'Bearer ' + str(get_token_for_user(User.objects.get(id=1)))
+
+
+def slugs(client, **headers):
+    response = client.get('/api/v1/categories/', **headers)
+    return [item['slug'] for item in response.json()['results']]
+
+
+client = Client()
+results = [slugs(client), slugs(client, HTTP_AUTHORIZATION=token)]
+response = client.post(
+    '/api/v1/categories/', {'name': 'Основная', 'slug': 'main'},
+    HTTP_AUTHORIZATION=token
+)
+results.append(response.status_code)
+results.append(slugs(client, HTTP_AUTHORIZATION=token))
+results.append(slugs(client))
+print(json.dumps(results))
+"""
+
+
+class Test29Replicas:
+
+    @pytest.fixture(autouse=True)
+    def replicas(self, settings, tmp_path):
+        settings.DB_REPLICAS = ['replica0']
+        settings.CACHES = {**settings.CACHES, 'replicas': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path / 'cache'),
+        }}
+        settings.DB_REPLICA_CACHE_ALIAS = 'replicas'
+
+    def handle(self, method, token='Bearer token', write=False, reads=1):
+        from api_yamdb.routers import ReplicaMiddleware, ReplicaRouter
+        from reviews.models import Title
+
+        router = ReplicaRouter()
+        aliases = []
+
+        def get_response(request):
+            for _ in range(reads):
+                aliases.append(router.db_for_read(Title))
+            if write:
+                router.db_for_write(Title)
+                aliases.append(router.db_for_read(Title))
+            return HttpResponse()
+
+        headers = {'HTTP_AUTHORIZATION': token} if token else {}
+        request = getattr(RequestFactory(), method)('/api/v1/titles/',
+                                                    **headers)
+        ReplicaMiddleware(get_response)(request)
+        return aliases
+
+    def test_01_safe_methods_read_from_replica(self):
+        assert self.handle('get') == ['replica0'], (
+            'Проверьте, что GET-запрос читает с реплики.'
+        )
+        assert self.handle('post') == ['default'], (
+            'Проверьте, что POST-запрос читает с основной БД.'
+        )
+
+    def test_02_reads_after_write_use_default(self):
+        assert self.handle('get', token=None, write=True) == [
+            'replica0', 'default'
+        ]
+
+    def test_03_sticky_after_write(self):
+        self.handle('patch', write=True)
+        assert self.handle('get') == ['default'], (
+            'Проверьте, что после записи клиент читает с основной БД.'
+        )
+        assert self.handle('get', token='Bearer other') == ['replica0']
+        caches['replicas'].clear()
+        assert self.handle('get') == ['replica0']
+
+    def test_04_outside_request_and_without_replicas(self, settings):
+        from api_yamdb.routers import ReplicaRouter
+        from reviews.models import Title
+
+        assert ReplicaRouter().db_for_read(Title) == 'default'
+        settings.DB_REPLICAS = []
+        assert self.handle('get') == ['default']
+
+    def test_05_async_chain(self):
+        from asgiref.sync import async_to_sync
+
+        from api_yamdb.routers import ReplicaMiddleware, ReplicaRouter
+        from reviews.models import Title
+
+        aliases = []
+
+        async def get_response(request):
+            aliases.append(ReplicaRouter().db_for_read(Title))
+            return HttpResponse()
+
+        middleware = ReplicaMiddleware(get_response)
+        assert asyncio.iscoroutinefunction(middleware), (
+            'Проверьте, что под ASGI middleware не делает цепочку '
+            'синхронной.'
+        )
+        async_to_sync(middleware)(RequestFactory().get('/api/v1/titles/'))
+        assert aliases == ['replica0']
+
+    def test_06_one_replica_per_request(self, settings):
+        settings.DB_REPLICAS = [f'replica{number}' for number in range(8)]
+        for _ in range(5):
+            assert len(set(self.handle('get', reads=10))) == 1, (
+                'Проверьте, что все чтения запроса идут в одну реплику.'
+            )
+
+    def test_07_local_cache_is_rejected(self, settings):
+        from api_yamdb.routers import ReplicaMiddleware
+
+        settings.DB_REPLICA_CACHE_ALIAS = 'default'
+        with pytest.raises(ImproperlyConfigured):
+            ReplicaMiddleware(lambda request: HttpResponse())
+        settings.DB_REPLICAS = []
+        ReplicaMiddleware(lambda request: HttpResponse())
+
+    def test_08_two_sqlite_files(self, tmp_path):
+        environment = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'api_yamdb.settings',
+            'DB_ENGINE': 'sqlite',
+            'SQLITE_PATH': str(tmp_path / 'default.sqlite3'),
+            'SQLITE_REPLICA_PATHS': str(tmp_path / 'replica.sqlite3'),
+            'DB_REPLICA_CACHE_LOCATION': str(tmp_path / 'cache'),
+        }
+        result = subprocess.run(
+            [sys.executable, '-c', END_TO_END_SCRIPT], cwd=MANAGE_PATH,
+            env=environment, capture_output=True, text=True
+        )
+        assert result.returncode == 0, result.stderr
+        assert json.loads(result.stdout) == [
+            ['replica'], ['replica'], 201, ['main'], ['replica']
+        ], (
+            'Проверьте, что GET-запросы читают с реплики, а клиент после '
+            'записи - с основной БД.'
+        )
@@ -0,0 +1,74 @@
+import asyncio
+import threading
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.urls import resolve
+from rest_framework.test import APIRequestFactory
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30AsyncViews:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def title(self):
+        from reviews.models import Category, Title
+
+        category = Category.objects.create(name='Фильм', slug='films')
+        return Title.objects.create(name='Сталкер', year=1979,
+                                    category=category)
+
+    def call(self, request):
+        from api.async_views import async_read_view
+
+        match = resolve(request.path)
+        view = async_read_view(match.func)
+        return async_to_sync(view)(request, *match.args, **match.kwargs)
+
+    def test_01_read_in_pool(self, client, title, monkeypatch):
+        from api.views import TitleViewSet
+
+        threads = []
+        list_view = TitleViewSet.list
+
+        def list_spy(self, request, *args, **kwargs):
+            threads.append(threading.get_ident())
+            return list_view(self, request, *args, **kwargs)
+
+        monkeypatch.setattr(TitleViewSet, 'list', list_spy)
+        response = self.call(APIRequestFactory().get(self.TITLES_URL))
+        assert response.status_code == HTTPStatus.OK
+        assert response.data['results'][0]['name'] == 'Сталкер'
+        assert response.rendered_content, (
+            'Проверьте, что ответ рендерится в потоке из пула.'
+        )
+        assert threads and threads[0] != threading.get_ident()
+        assert response.data == client.get(self.TITLES_URL).data
+
+    def test_02_writes_pass_through(self, admin, token_admin, title):
+        response = self.call(APIRequestFactory().post(
+            self.TITLES_URL,
+            {'name': 'Солярис', 'year': 1972, 'category': 'films',
+             'genre': []},
+            format='json',
+            HTTP_AUTHORIZATION=f'Bearer {token_admin["access"]}'
+        ))
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что небезопасные запросы обрабатываются как прежде.'
+        )
+
+    def test_03_make_async(self):
+        from api.async_views import make_async
+        from api.urls import router_v1
+
+        patterns = make_async(router_v1.urls)
+        wrapped = {
+            pattern.name for pattern in patterns
+            if asyncio.iscoroutinefunction(pattern.callback)
+        }
+        assert wrapped == {
+            'titles-list', 'titles-detail', 'reviews-list', 'comments-list'
+        }
@@ -0,0 +1,76 @@
+import datetime
+import io
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+
+class Test31Json:
+
+    DATA = {
+        'name': 'Сталкер',
+        'rating': 8.5,
+        'price': Decimal('10.50'),
+        'published': datetime.datetime(
+            2024, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc
+        ),
+        'date': datetime.date(2024, 1, 2),
+        'label': gettext_lazy('Фильм'),
+        'line': 'a\u2028b\u2029c',
+        'counts': {1: 2},
+        'genre': [{'name': 'Драма', 'slug': 'drama'}],
+        'empty': None,
+    }
+
+    def test_01_same_output(self):
+        from api.renderers import ORJSONRenderer
+
+        assert ORJSONRenderer().render(self.DATA) == (
+            JSONRenderer().render(self.DATA)
+        ), (
+            'Проверьте, что рендерер на orjson выводит тот же JSON, '
+            'что и JSONRenderer.'
+        )
+        assert ORJSONRenderer().render(None) == b''
+
+    @pytest.mark.parametrize('accepted_media_type, context', (
+        ('application/json; indent=4', None),
+        (None, {'indent': 2}),
+    ))
+    def test_02_indent_falls_back(self, accepted_media_type, context):
+        from api.renderers import ORJSONRenderer
+
+        assert ORJSONRenderer().render(
+            self.DATA, accepted_media_type, context
+        ) == JSONRenderer().render(self.DATA, accepted_media_type, context)
+
+    def test_03_disabled(self, settings, monkeypatch):
+        from api import renderers
+
+        settings.API_ORJSON = False
+        monkeypatch.setattr(renderers, 'orjson', object())
+        assert renderers.ORJSONRenderer().render(self.DATA) == (
+            JSONRenderer().render(self.DATA)
+        )
+        assert renderers.ORJSONParser().parse(
+            io.BytesIO('{"name": "Сталкер"}'.encode())
+        ) == {'name': 'Сталкер'}
+        settings.API_ORJSON = True
+        monkeypatch.setattr(renderers, 'orjson', None)
+        assert renderers.ORJSONRenderer().render(self.DATA) == (
+            JSONRenderer().render(self.DATA)
+        ), 'Проверьте, что без orjson используется стандартный json.'
+
+    def test_04_parser(self):
+        from api.renderers import ORJSONParser
+
+        parser = ORJSONParser()
+        assert parser.parse(
+            io.BytesIO('{"genre": ["драма"], "year": 1979}'.encode())
+        ) == {'genre': ['драма'], 'year': 1979}
+        for body in (b'{"name": ', b'[NaN]'):
+            with pytest.raises(ParseError):
+                parser.parse(io.BytesIO(body))